@@ -0,0 +1,29 @@
+"""covering index for per-college student USN/email preload (replaces ix_students_college)
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets the CSV import preload (college -> usn, email) run as an index-only scan
+    op.create_index(
+        "idx_student_college_usn_email",
+        "students",
+        ["college"],
+        postgresql_include=["usn", "email"],
+    )
+    # same leading column, so the plain college index (from index=True) is redundant
+    op.execute("DROP INDEX IF EXISTS ix_students_college")
+
+
+def downgrade():
+    op.execute("CREATE INDEX IF NOT EXISTS ix_students_college ON students (college)")
+    op.drop_index("idx_student_college_usn_email", table_name="students")
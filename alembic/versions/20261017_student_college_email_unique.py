@@ -0,0 +1,58 @@
+"""case-insensitive unique email per college for students
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+Requires that no two students in the same college share an email differing
+only in case. upgrade() checks this first and aborts with the offending
+(college, email) pairs; resolve them by hand (fix or remove one of each pair)
+and re-run. Rows are never merged or deleted automatically.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    dupes = conn.execute(sa.text(
+        """
+        SELECT college, lower(email) AS email, count(*) AS n
+        FROM students
+        WHERE email IS NOT NULL
+        GROUP BY college, lower(email)
+        HAVING count(*) > 1
+        ORDER BY college, lower(email)
+        LIMIT 50
+        """
+    )).all()
+    if dupes:
+        listed = "\n".join(f"  {r.college!r}: {r.email!r} x{r.n}" for r in dupes)
+        raise RuntimeError(
+            "Cannot create uq_students_college_lower_email: students share an email "
+            "(case-insensitive) within a college. Resolve these rows and re-run:\n" + listed
+        )
+
+    # create_student relies on INSERT ... ON CONFLICT DO NOTHING, so every
+    # duplicate rule has to be enforced by a unique index:
+    #   uq_students_college_usn   (college, usn)          -- already present
+    #   uq_students_college_lower_email (college, lower(email)) below
+    op.create_index(
+        "uq_students_college_lower_email",
+        "students",
+        ["college", sa.text("lower(email)")],
+        unique=True,
+        postgresql_where=sa.text("email IS NOT NULL"),
+    )
+    # the case-sensitive (college, email) constraint is implied by the index above
+    op.execute("ALTER TABLE students DROP CONSTRAINT IF EXISTS uq_students_college_email")
+
+
+def downgrade():
+    op.create_unique_constraint("uq_students_college_email", "students", ["college", "email"])
+    op.drop_index("uq_students_college_lower_email", table_name="students")
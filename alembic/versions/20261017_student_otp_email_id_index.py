@@ -0,0 +1,29 @@
+"""partial index for latest unused student OTP session lookup
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # verify_student_otp_and_issue_token: WHERE email = ? AND used_at IS NULL
+    # ORDER BY id DESC LIMIT 1  ->  single index probe, no sort.
+    # (faculty_activation_sessions.id is already the primary key.)
+    op.create_index(
+        "idx_student_otp_email_id",
+        "student_otp_sessions",
+        ["email", sa.text("id DESC")],
+        postgresql_where=sa.text("used_at IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("idx_student_otp_email_id", table_name="student_otp_sessions")
@@ -4,6 +4,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, date as date_type, time as time_type, timezone, timedelta
 from zoneinfo import ZoneInfo
 from typing import Any, Optional
+import asyncio
+import os
 import secrets
 from urllib.parse import quote
 from app.models.activity_face_check import ActivityFaceCheck
@@ -822,6 +824,31 @@ async def _infer_activity_type_ids_from_sessions(
     return [int(r[0]) for r in aq.all() if r and r[0] is not None]
 
 
+# PDF render (reportlab/pypdf) + MinIO PUT are blocking; run them off the loop
+_CERT_RENDER_CONCURRENCY = os.cpu_count() or 4
+
+
+async def _build_and_upload_cert(cert_id: int, pdf_kwargs: dict, sem: asyncio.Semaphore) -> str:
+    async with sem:
+        pdf_bytes = await asyncio.to_thread(build_certificate_pdf, **pdf_kwargs)
+        return await asyncio.to_thread(upload_certificate_pdf_bytes, cert_id, pdf_bytes)
+
+
+async def _render_and_upload_certs(pending: list[tuple[Certificate, dict]]) -> None:
+    """
+    Render + upload queued certificates concurrently on a bounded thread
+    pool, then set pdf_path on each row (still inside the caller's txn).
+    """
+    if not pending:
+        return
+    sem = asyncio.Semaphore(_CERT_RENDER_CONCURRENCY)
+    keys = await asyncio.gather(
+        *(_build_and_upload_cert(cert.id, kw, sem) for cert, kw in pending)
+    )
+    for (cert, _), object_key in zip(pending, keys):
+        cert.pdf_path = object_key
+
+
 async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
     """
     ✅ FIXED PERMANENTLY:
@@ -942,6 +969,8 @@ async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
     # Main issue loop
     # -----------------------
     issued = 0
+    # (cert, build_certificate_pdf kwargs) rendered in parallel after the loop
+    pending: list[tuple[Certificate, dict]] = []
 
     for sub in submissions:
         if sub.student_id is None:
@@ -1004,7 +1033,7 @@ async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
                 f"?cert_id={quote(cert.certificate_no)}&sig={quote(sig)}"
             )
 
-            pdf_bytes = build_certificate_pdf(
+            pending.append((cert, dict(
                 template_pdf_path=settings.CERT_TEMPLATE_PDF_PATH,
                 certificate_no=cert.certificate_no,
                 issue_date=(cert.issued_at.date().isoformat() if cert.issued_at else now_ist.date().isoformat()),
@@ -1014,13 +1043,13 @@ async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
                 venue_name=venue_name,
                 activity_points=int(points_awarded),
                 verify_url=verify_url,
-            )
-
-            object_key = upload_certificate_pdf_bytes(cert.id, pdf_bytes)
-            cert.pdf_path = object_key
+            )))
 
             issued += 1
 
+    await _render_and_upload_certs(pending)
+    pending.clear()
+
     # -----------------------
     # Mapping mismatch retry
     # -----------------------
@@ -1093,7 +1122,7 @@ async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
                         f"?cert_id={quote(cert.certificate_no)}&sig={quote(sig)}"
                     )
 
-                    pdf_bytes = build_certificate_pdf(
+                    pending.append((cert, dict(
                         template_pdf_path=settings.CERT_TEMPLATE_PDF_PATH,
                         certificate_no=cert.certificate_no,
                         issue_date=(cert.issued_at.date().isoformat() if cert.issued_at else now_ist.date().isoformat()),
@@ -1103,13 +1132,12 @@ async def _issue_certificates_for_event(db: AsyncSession, event: Event) -> int:
                         venue_name=venue_name,
                         activity_points=int(points_awarded),
                         verify_url=verify_url,
-                    )
-
-                    object_key = upload_certificate_pdf_bytes(cert.id, pdf_bytes)
-                    cert.pdf_path = object_key
+                    )))
 
                     issued += 1
 
+            await _render_and_upload_certs(pending)
+
     await db.commit()
     return issued
 
@@ -1,23 +1,29 @@
 import os
+import asyncio
+import logging
 import secrets
 import hashlib
 import hmac
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
+from itsdangerous import URLSafeTimedSerializer
 
 from app.models.faculty import Faculty
 from app.models.faculty_activation_session import FacultyActivationSession
 from app.schemas.faculty import FacultyCreateRequest
 from app.core.file_storage import upload_faculty_image
 from app.core.email_service import send_activation_email, send_faculty_otp_email
+from app.core.email_queue import enqueue_email
 from app.core.faculty_tokens import (
     create_activation_token,
     hash_token,
     verify_token,
     activation_expiry_dt,
+    ACTIVATION_TOKEN_MAX_AGE,
+    ACTIVATION_TOKEN_SECRET,
 )
 
 # ✅ Use ONLY passlib via security.py — never import raw bcrypt directly.
@@ -25,6 +31,12 @@ from app.core.faculty_tokens import (
 # bcrypt implementation and format, preventing the passlib checksum error.
 from app.core.security import hash_password
 
+logger = logging.getLogger(__name__)
+
+
+# Short-lived set-password token signer (same secret/salt as activation links)
+_SET_PW_SERIALIZER = URLSafeTimedSerializer(secret_key=ACTIVATION_TOKEN_SECRET, salt="faculty-activation")
+
 
 # ---------------------------
 # Helpers
@@ -51,8 +63,7 @@ def generate_session_id() -> str:
 
 def generate_otp() -> str:
     # 6-digit OTP
-    import random
-    return f"{random.randint(0, 999999):06d}"
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 
 def hash_otp(otp: str) -> str:
@@ -75,8 +86,8 @@ async def create_faculty(
     image_filename: str | None = None,
 ) -> tuple[Faculty, bool]:
     # check existing
-    q = await db.execute(select(Faculty).where(Faculty.email == payload.email))
-    existing = q.scalar_one_or_none()
+    q = await db.execute(select(Faculty).where(Faculty.email == payload.email).limit(1))
+    existing = q.scalars().first()
     if existing:
         raise HTTPException(status_code=409, detail="Faculty already exists with this email")
 
@@ -90,27 +101,27 @@ async def create_faculty(
 
     token = create_activation_token(payload.email)
     token_hash = hash_token(token)
-    print("\n================ ACTIVATION TOKEN ================")
-    print(f"EMAIL: {payload.email}")
-    print(f"TOKEN: {token}")
-    print(f"URL : http://31.97.230.171:8000/api/faculty/activation/validate?token={token}")
-    print("==================================================\n")
-
-    faculty = Faculty(
-        full_name=payload.full_name,
-        college=payload.college,
-        email=payload.email,
-        role=payload.role,
-        is_active=False,
-        activation_token_hash=token_hash,
-        activation_expires_at=activation_expiry_dt(),
-        image_url=image_url,
-        # password_hash / password_set_at remain None initially
-    )
-
-    db.add(faculty)
+    logger.debug("Activation token generated email=%s", payload.email)
+
+    # Single INSERT ... RETURNING: id + defaults come back in one round trip
+    faculty = (
+        await db.execute(
+            insert(Faculty)
+            .values(
+                full_name=payload.full_name,
+                college=payload.college,
+                email=payload.email,
+                role=payload.role,
+                is_active=False,
+                activation_token_hash=token_hash,
+                activation_expires_at=activation_expiry_dt(),
+                image_url=image_url,
+                # password_hash / password_set_at remain None initially
+            )
+            .returning(Faculty)
+        )
+    ).scalar_one()
     await db.commit()
-    await db.refresh(faculty)
 
     # activation URL (frontend page) OR API activation endpoint
     frontend_base = os.getenv("FRONTEND_BASE_URL", "").rstrip("/")
@@ -120,17 +131,19 @@ async def create_faculty(
     else:
         activate_url = "http://31.97.230.171:8000/api/faculty/activate?token=" + token
 
-    # do not crash if email not configured
+    # Queued for the background email worker; the response does not wait on Brevo.
+    # email_sent reports whether the send was accepted, delivery errors are logged.
     email_sent = False
     try:
-        await send_activation_email(
+        enqueue_email(
+            send_activation_email,
             to_email=faculty.email,
             to_name=faculty.full_name,
             activate_url=activate_url,
         )
         email_sent = True
-    except Exception as e:
-        print(f"[WARN] Activation email not sent for {faculty.email}: {e}")
+    except asyncio.QueueFull as e:
+        logger.warning("Activation email not queued for %s: %s", faculty.email, e)
 
     return faculty, email_sent
 
@@ -151,18 +164,16 @@ async def validate_activation_token_and_create_session(
     Validates activation link token. Creates activation session.
     Returns: (activation_session_id, masked_email, activation_link_expires_at)
     """
-    max_age_seconds = int(os.getenv("ACTIVATION_TOKEN_EXPIRE_HOURS", "48")) * 3600
-
     try:
-        data = verify_token(token, max_age_seconds=max_age_seconds)
+        data = verify_token(token, max_age_seconds=ACTIVATION_TOKEN_MAX_AGE)
         email = data.get("email")
         if not email:
             raise ValueError("Invalid token payload")
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid or expired activation token")
 
-    q = await db.execute(select(Faculty).where(Faculty.email == email))
-    faculty = q.scalar_one_or_none()
+    q = await db.execute(select(Faculty).where(Faculty.email == email).limit(1))
+    faculty = q.scalars().first()
     if not faculty:
         raise HTTPException(status_code=404, detail="Faculty not found")
 
@@ -200,76 +211,106 @@ async def send_activation_otp(
     """
     Generates OTP, stores hash+expiry in activation session and sends OTP email.
     """
+    now = datetime.now(timezone.utc)
+
     q = await db.execute(
-        select(FacultyActivationSession).where(FacultyActivationSession.id == activation_session_id)
+        select(FacultyActivationSession)
+        .where(FacultyActivationSession.id == activation_session_id)
+        .limit(1)
     )
-    sess = q.scalar_one_or_none()
+    sess = q.scalars().first()
     if not sess:
         raise HTTPException(status_code=404, detail="Activation session not found")
 
-    fq = await db.execute(select(Faculty).where(Faculty.id == sess.faculty_id))
-    faculty = fq.scalar_one_or_none()
+    fq = await db.execute(select(Faculty).where(Faculty.id == sess.faculty_id).limit(1))
+    faculty = fq.scalars().first()
     if not faculty:
         raise HTTPException(status_code=404, detail="Faculty not found")
 
     otp = generate_otp()
 
-    print("\n========= FACULTY OTP =========")
-    print(f"EMAIL: {faculty.email}")
-    print(f"OTP  : {otp}")
-    print("================================\n")
+    logger.debug("Faculty OTP generated email=%s", faculty.email)
 
     sess.otp_hash = hash_otp(otp)
-    sess.otp_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+    sess.otp_expires_at = now + timedelta(minutes=10)
 
     await db.commit()
 
-    await send_faculty_otp_email(
-        to_email=faculty.email,
-        to_name=faculty.full_name,
-        otp=otp,
-    )
+    # OTP is persisted; delivery happens on the background email worker
+    try:
+        enqueue_email(
+            send_faculty_otp_email,
+            to_email=faculty.email,
+            to_name=faculty.full_name,
+            otp=otp,
+        )
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Email service busy. Please retry shortly.")
 
 
-async def verify_activation_otp(
-    activation_session_id: str,
-    otp: str,
-    db: AsyncSession,
-) -> str:
+async def _raise_otp_rejection(activation_session_id: str, now: datetime, db: AsyncSession) -> None:
     """
-    Verifies OTP. On success returns a short-lived set_password_token.
+    Slow path after the attempt UPDATE matched nothing: re-read the
+    session only to report the precise reason.
     """
     q = await db.execute(
-        select(FacultyActivationSession).where(FacultyActivationSession.id == activation_session_id)
+        select(FacultyActivationSession)
+        .where(FacultyActivationSession.id == activation_session_id)
+        .limit(1)
     )
-    sess = q.scalar_one_or_none()
+    sess = q.scalars().first()
     if not sess:
         raise HTTPException(status_code=404, detail="Activation session not found")
 
     if not sess.otp_hash or not sess.otp_expires_at:
         raise HTTPException(status_code=400, detail="OTP not generated yet. Please send OTP first.")
 
-    if sess.otp_expires_at < datetime.now(timezone.utc):
+    if sess.otp_expires_at < now:
         raise HTTPException(status_code=400, detail="OTP expired. Please resend OTP.")
 
-    if sess.otp_attempts >= 5:
-        raise HTTPException(status_code=429, detail="Too many attempts. Please resend OTP.")
+    raise HTTPException(status_code=429, detail="Too many attempts. Please resend OTP.")
 
-    ok = constant_time_equals(sess.otp_hash, hash_otp(otp))
-    sess.otp_attempts += 1
 
-    if not ok:
+async def verify_activation_otp(
+    activation_session_id: str,
+    otp: str,
+    db: AsyncSession,
+) -> str:
+    """
+    Verifies OTP. On success returns a short-lived set_password_token.
+    """
+    now = datetime.now(timezone.utc)
+
+    # Atomically consume one attempt; the WHERE clause enforces the
+    # attempt limit and expiry so parallel guesses cannot race past it.
+    res = await db.execute(
+        update(FacultyActivationSession)
+        .where(
+            FacultyActivationSession.id == activation_session_id,
+            FacultyActivationSession.otp_hash.is_not(None),
+            FacultyActivationSession.otp_expires_at >= now,
+            FacultyActivationSession.otp_attempts < 5,
+        )
+        .values(otp_attempts=FacultyActivationSession.otp_attempts + 1)
+        .returning(FacultyActivationSession.otp_hash)
+    )
+    otp_hash = res.scalar()
+
+    if otp_hash is None:
+        await _raise_otp_rejection(activation_session_id, now, db)
+
+    if not constant_time_equals(otp_hash, hash_otp(otp)):
         await db.commit()
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    sess.otp_verified_at = datetime.now(timezone.utc)
+    await db.execute(
+        update(FacultyActivationSession)
+        .where(FacultyActivationSession.id == activation_session_id)
+        .values(otp_verified_at=now)
+    )
     await db.commit()
 
-    s_secret = os.getenv("ACTIVATION_TOKEN_SECRET", "change-me")
-    from itsdangerous import URLSafeTimedSerializer
-    s = URLSafeTimedSerializer(secret_key=s_secret, salt="faculty-activation")
-
-    set_password_token = s.dumps({"session_id": activation_session_id, "purpose": "set-password"})
+    set_password_token = _SET_PW_SERIALIZER.dumps({"session_id": activation_session_id, "purpose": "set-password"})
     return set_password_token
 
 
@@ -284,13 +325,11 @@ async def set_password_after_otp(
     ✅ Uses hash_password() from security.py (passlib/bcrypt) — the same
        function used everywhere else — so verify_password() will always work.
     """
-    # Validate token (15 min)
-    s_secret = os.getenv("ACTIVATION_TOKEN_SECRET", "change-me")
-    from itsdangerous import URLSafeTimedSerializer
-    s = URLSafeTimedSerializer(secret_key=s_secret, salt="faculty-activation")
+    now = datetime.now(timezone.utc)
 
+    # Validate token (15 min)
     try:
-        data = s.loads(set_password_token, max_age=15 * 60)
+        data = _SET_PW_SERIALIZER.loads(set_password_token, max_age=15 * 60)
         if data.get("purpose") != "set-password":
             raise ValueError("Wrong token purpose")
         session_id = data.get("session_id")
@@ -299,22 +338,24 @@ async def set_password_after_otp(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid or expired set password token")
 
-    q = await db.execute(select(FacultyActivationSession).where(FacultyActivationSession.id == session_id))
-    sess = q.scalar_one_or_none()
+    q = await db.execute(
+        select(FacultyActivationSession).where(FacultyActivationSession.id == session_id).limit(1)
+    )
+    sess = q.scalars().first()
     if not sess:
         raise HTTPException(status_code=404, detail="Activation session not found")
 
     if not sess.otp_verified_at:
         raise HTTPException(status_code=400, detail="OTP not verified")
 
-    fq = await db.execute(select(Faculty).where(Faculty.id == sess.faculty_id))
-    faculty = fq.scalar_one_or_none()
+    fq = await db.execute(select(Faculty).where(Faculty.id == sess.faculty_id).limit(1))
+    faculty = fq.scalars().first()
     if not faculty:
         raise HTTPException(status_code=404, detail="Faculty not found")
 
     # ✅ hash_password() imported from security.py — uses passlib, not raw bcrypt
     faculty.password_hash     = hash_password(new_password)
-    faculty.password_set_at   = datetime.now(timezone.utc)
+    faculty.password_set_at   = now
     faculty.is_active         = True
 
     # Clear activation token fields (single-use link)
@@ -335,17 +376,16 @@ async def activate_faculty(token: str, db: AsyncSession) -> None:
     OLD behavior: activates immediately without OTP.
     Keep only if you want backward compatibility; otherwise remove route.
     """
-    max_age_seconds = int(os.getenv("ACTIVATION_TOKEN_EXPIRE_HOURS", "48")) * 3600
     try:
-        data = verify_token(token, max_age_seconds=max_age_seconds)
+        data = verify_token(token, max_age_seconds=ACTIVATION_TOKEN_MAX_AGE)
         email = data.get("email")
         if not email:
             raise ValueError("Invalid token payload")
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid or expired activation token")
 
-    q = await db.execute(select(Faculty).where(Faculty.email == email))
-    faculty = q.scalar_one_or_none()
+    q = await db.execute(select(Faculty).where(Faculty.email == email).limit(1))
+    faculty = q.scalars().first()
     if not faculty:
         raise HTTPException(status_code=404, detail="Faculty not found")
 
@@ -1,8 +1,10 @@
 import os
+import asyncio
+import logging
 import hashlib
 import hmac
+import secrets
 from datetime import datetime, timezone, timedelta
-import random
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,10 +13,14 @@ from fastapi import HTTPException
 from app.models.student import Student
 from app.models.student_otp_session import StudentOtpSession
 from app.core.email_service import send_student_otp_email
+from app.core.email_queue import enqueue_email
+from app.core.jwt import create_access_token
+
+logger = logging.getLogger(__name__)
 
 
 def _otp() -> str:
-    return f"{random.randint(0, 999999):06d}"
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 
 def _hash(v: str) -> str:
@@ -25,17 +31,29 @@ def _eq(a: str, b: str) -> bool:
     return hmac.compare_digest(a, b)
 
 
-async def request_student_otp(db: AsyncSession, email: str) -> None:
-    q = await db.execute(select(Student).where(Student.email == email))
-    student = q.scalar_one_or_none()
-    if not student:
+async def _student_by_email(db: AsyncSession, email: str) -> Student:
+    # Emails are unique per college only: an address shared across colleges
+    # can't identify a single student, so refuse it instead of picking one.
+    rows = (
+        await db.execute(
+            select(Student).where(Student.email == email).order_by(Student.id).limit(2)
+        )
+    ).scalars().all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Student not found with this email")
+    if len(rows) > 1:
+        raise HTTPException(
+            status_code=409,
+            detail="This email is registered with more than one college. Please contact your college.",
+        )
+    return rows[0]
+
+
+async def request_student_otp(db: AsyncSession, email: str) -> None:
+    student = await _student_by_email(db, email)
 
     otp = _otp()
-    print("\n========= STUDENT OTP =========")
-    print(f"EMAIL: {email}")
-    print(f"OTP  : {otp}")
-    print("================================\n")
+    logger.debug("Student OTP generated email=%s", email)
 
     sess = StudentOtpSession(
         email=email,
@@ -46,10 +64,16 @@ async def request_student_otp(db: AsyncSession, email: str) -> None:
     db.add(sess)
     await db.commit()
 
-    await send_student_otp_email(to_email=email, to_name=student.name, otp=otp)
+    # OTP is persisted; delivery happens on the background email worker
+    try:
+        enqueue_email(send_student_otp_email, to_email=email, to_name=student.name, otp=otp)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Email service busy. Please retry shortly.")
 
 
 async def verify_student_otp_and_issue_token(db: AsyncSession, email: str, otp: str) -> str:
+    now = datetime.now(timezone.utc)
+
     # latest non-used session
     q = await db.execute(
         select(StudentOtpSession)
@@ -62,7 +86,7 @@ async def verify_student_otp_and_issue_token(db: AsyncSession, email: str, otp:
     if not sess:
         raise HTTPException(status_code=400, detail="OTP not requested or already used")
 
-    if sess.otp_expires_at < datetime.now(timezone.utc):
+    if sess.otp_expires_at < now:
         raise HTTPException(status_code=400, detail="OTP expired. Please request again.")
 
     if sess.attempts >= 5:
@@ -74,12 +98,12 @@ async def verify_student_otp_and_issue_token(db: AsyncSession, email: str, otp:
         await db.commit()
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    sess.used_at = datetime.now(timezone.utc)
+    sess.used_at = now
     await db.commit()
 
-    # ✅ issue JWT token (hook into your existing JWT util)
-    # Replace below line with your existing token creator
-    from app.core.jwt import create_access_token  # <-- IF you have it
-    token = create_access_token({"sub": email, "role": "student"})
+    student = await _student_by_email(db, email)
+
+    # ✅ sub = student id, same token contract as admin/faculty (type="access")
+    token = create_access_token({"sub": str(student.id), "email": email, "role": "student", "type": "access"})
 
     return token
\ No newline at end of file
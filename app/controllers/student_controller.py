@@ -4,27 +4,36 @@
 # - Adds small robustness: safe email normalization, handles missing email header properly, avoids "row.get('')" edge
 
 import os
+import asyncio
 import csv
 import io
+import logging
 from typing import List, Tuple
 
-from sqlalchemy import select, or_
+from sqlalchemy import select, insert, or_, func, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.faculty import Faculty
 from app.models.student import Student, StudentType
 from app.schemas.student import StudentCreate
-from app.core.email_service import send_student_welcome_email
+from app.core.email_service import send_student_welcome_email, send_student_welcome_email_bulk
+from app.core.email_queue import enqueue_email
 
+logger = logging.getLogger(__name__)
 
-def _clean(v: str) -> str:
-    return (v or "").strip()
+
+_STYPE_MAP = {
+    "DIPLOMA": StudentType.DIPLOMA,
+    "DIPLOMA_SCHEME": StudentType.DIPLOMA,
+    "DIPLOMA SCHEME": StudentType.DIPLOMA,
+}
 
 
 def _parse_student_type(v: str) -> StudentType:
-    x = (v or "").strip().upper()
-    if x in ("DIPLOMA", "DIPLOMA_SCHEME", "DIPLOMA SCHEME"):
-        return StudentType.DIPLOMA
-    return StudentType.REGULAR
+    return _STYPE_MAP.get((v or "").strip().upper(), StudentType.REGULAR)
 
 
 def _required_points_for_type(stype: StudentType) -> int:
@@ -40,16 +49,86 @@ def _coerce_student_type(v) -> StudentType:
     return _parse_student_type(str(v))
 
 
-def _normalize_csv_headers(fieldnames: list[str] | None) -> tuple[dict[str, str], set[str]]:
+def _normalize_csv_headers(fieldnames: list[str] | None) -> dict[str, int]:
     """
     Returns:
-      field_map: normalized_lower_header -> original_header
-      headers: set of normalized_lower_header
+      col: normalized_lower_header -> column index
     """
     if not fieldnames:
-        return {}, set()
-    field_map = {h.strip().lower(): h for h in fieldnames if h and h.strip()}
-    return field_map, set(field_map.keys())
+        return {}
+    return {h.strip().lower(): i for i, h in enumerate(fieldnames) if h and h.strip()}
+
+
+# Above this many rows the CSV import switches from executemany INSERT to COPY
+COPY_THRESHOLD = 500
+
+# Rows per COPY call; bounds the converted record tuples held at once
+COPY_BATCH_SIZE = 10_000
+
+_COPY_COLUMNS = (
+    "college",
+    "name",
+    "usn",
+    "branch",
+    "email",
+    "student_type",
+    "required_total_points",
+    "total_points_earned",
+    "passout_year",
+    "admitted_year",
+    "created_by_faculty_id",
+)
+
+
+def _chunked(seq: list, n: int):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+async def _copy_students(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Bulk-load students over the session's own asyncpg connection with
+    COPY, so it stays inside the current transaction. Rows are converted
+    and copied COPY_BATCH_SIZE at a time.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    for batch in _chunked(rows, COPY_BATCH_SIZE):
+        records = [
+            tuple(r[c].value if c == "student_type" else r[c] for c in _COPY_COLUMNS)
+            for r in batch
+        ]
+        await raw.driver_connection.copy_records_to_table(
+            Student.__tablename__,
+            records=records,
+            columns=_COPY_COLUMNS,
+        )
+
+
+def _queue_welcome_emails(recipients: List[Tuple[str, str]]) -> None:
+    """
+    Hand (email, name) pairs to the background email worker, which paces
+    them to the provider rate limit. Never blocks the caller.
+    """
+    app_url = os.getenv("STUDENT_APP_DOWNLOAD_URL", "https://vikasana.org/app")
+    try:
+        if len(recipients) == 1:
+            to_email, to_name = recipients[0]
+            enqueue_email(
+                send_student_welcome_email,
+                to_email=to_email,
+                to_name=to_name,
+                app_download_url=app_url,
+            )
+        elif recipients:
+            # bulk import: one queued job, a single Brevo call per 1000 recipients
+            enqueue_email(
+                send_student_welcome_email_bulk,
+                recipients=recipients,
+                app_download_url=app_url,
+            )
+    except asyncio.QueueFull:
+        logger.warning("Email queue full; %d student welcome email(s) not queued", len(recipients))
 
 
 async def create_student(
@@ -58,6 +137,7 @@ async def create_student(
     *,
     faculty_college: str,
     faculty_id: int | None = None,  # ✅ mentor id
+    mentor: Faculty | None = None,  # ✅ mentor row when the caller already has it
 ) -> Student:
     faculty_college = (faculty_college or "").strip()
     if not faculty_college:
@@ -66,56 +146,62 @@ async def create_student(
     usn = payload.usn.strip()
     email = str(payload.email).strip().lower() if payload.email else None
 
-    # ✅ Duplicate check within same college (USN or Email)
-    dup_stmt = select(Student).where(
-        Student.college == faculty_college,
-        or_(
-            Student.usn == usn,
-            Student.email == email if email else False,
-        ),
-    )
-    existing = (await db.execute(dup_stmt)).scalar_one_or_none()
-    if existing:
-        if existing.usn == usn:
-            raise ValueError(f"Duplicate USN in this college: {usn}")
-        raise ValueError(f"Duplicate Email in this college: {email}")
-
     stype = _coerce_student_type(payload.student_type)
     required_points = _required_points_for_type(stype)
 
-    s = Student(
-        college=faculty_college,  # ✅ enforced
-        name=payload.name.strip(),
-        usn=usn,
-        branch=payload.branch.strip(),
-        email=email,
-        student_type=stype,
-
-        # ✅ Activity Tracker fields
-        required_total_points=required_points,
-        total_points_earned=0,
+    # ✅ Duplicates within same college (USN or Email) are rejected by the
+    # unique indexes: one INSERT ... ON CONFLICT DO NOTHING RETURNING round trip.
+    stmt = (
+        pg_insert(Student)
+        .values(
+            college=faculty_college,  # ✅ enforced
+            name=payload.name.strip(),
+            usn=usn,
+            branch=payload.branch.strip(),
+            email=email,
+            student_type=stype,
+
+            # ✅ Activity Tracker fields
+            required_total_points=required_points,
+            total_points_earned=0,
+
+            passout_year=payload.passout_year,
+            admitted_year=payload.admitted_year,
+
+            # ✅ Mentor
+            created_by_faculty_id=faculty_id,
+        )
+        .on_conflict_do_nothing()
+        .returning(Student)
+    )
+    s = (await db.execute(stmt)).scalar_one_or_none()
+
+    if s is None:
+        # rare path: fetch just the USN to report which field collided
+        existing_usn = (
+            await db.execute(
+                select(Student.usn)
+                .where(Student.college == faculty_college, Student.usn == usn)
+                .limit(1)
+            )
+        ).scalar()
+        if existing_usn == usn:
+            raise ValueError(f"Duplicate USN in this college: {usn}")
+        raise ValueError(f"Duplicate Email in this college: {email}")
 
-        passout_year=payload.passout_year,
-        admitted_year=payload.admitted_year,
+    # RETURNING does not run the joined mentor load; attach it without
+    # marking the row dirty. Routes pass the guard's faculty, so this is
+    # normally no query at all (the guard's copy may come from the principal
+    # cache, i.e. detached, so db.get would not be an identity-map hit).
+    if mentor is None and faculty_id is not None:
+        mentor = await db.get(Faculty, faculty_id)
+    set_committed_value(s, "created_by_faculty", mentor)
 
-        # ✅ Mentor
-        created_by_faculty_id=faculty_id,
-    )
-    db.add(s)
     await db.commit()
-    await db.refresh(s)
 
-    # ✅ Welcome email (non-blocking)
+    # ✅ Welcome email (queued, delivered by the background email worker)
     if s.email:
-        try:
-            app_url = os.getenv("STUDENT_APP_DOWNLOAD_URL", "https://vikasana.org/app")
-            await send_student_welcome_email(
-                to_email=s.email,
-                to_name=s.name,
-                app_download_url=app_url,
-            )
-        except Exception as e:
-            print(f"[WARN] Student welcome email not sent for {s.email}: {e}")
+        _queue_welcome_emails([(s.email, s.name)])
 
     return s
 
@@ -146,65 +232,72 @@ async def create_students_from_csv(
     skipped = 0
     invalid = 0
 
-    try:
-        text = csv_bytes.decode("utf-8-sig")
-    except Exception:
-        text = csv_bytes.decode("utf-8", errors="replace")
-
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames:
+    # Decode lazily in chunks while parsing instead of materialising the whole str
+    stream = io.TextIOWrapper(io.BytesIO(csv_bytes), encoding="utf-8-sig", errors="replace", newline="")
+    reader = csv.reader(stream)
+    fieldnames = next(reader, None)
+    if not fieldnames:
         return (0, 0, 0, 0, ["CSV has no headers. Required: name, usn, branch, passout_year, admitted_year"])
 
-    field_map, headers = _normalize_csv_headers(reader.fieldnames)
+    col = _normalize_csv_headers(fieldnames)
 
     required = {"name", "usn", "branch", "passout_year", "admitted_year"}
-    missing = required - headers
+    missing = required - col.keys()
     if missing:
         return (0, 0, 0, 0, [f"Missing headers: {', '.join(sorted(missing))}"])
 
-    rows = list(reader)
-    total_rows = len(rows)
-
-    # ✅ preload existing USNs/emails for this college
-    existing_rows = (
-        await db.execute(select(Student.usn, Student.email).where(Student.college == faculty_college))
-    ).all()
-    existing_usns = {r[0] for r in existing_rows if r[0]}
-    existing_emails = {str(r[1]).lower() for r in existing_rows if r[1]}
-
-    for idx, row in enumerate(rows, start=2):
+    i_name, i_usn, i_branch = col["name"], col["usn"], col["branch"]
+    i_passout, i_admitted = col["passout_year"], col["admitted_year"]
+    # optional columns: None when absent (never index past the header, where
+    # a row's extra cells live)
+    width = len(fieldnames)
+    i_email, i_stype = col.get("email"), col.get("student_type")
+    pad = [""] * width
+
+    # Pass 1: stream + validate rows; nothing touches the DB yet
+    parsed: List[Tuple[int, dict]] = []
+    row_errors: List[Tuple[int, str]] = []
+    # intra-CSV duplicates, kept apart from the DB-side sets below
+    seen_usns: set[str] = set()
+    seen_emails: set[str] = set()
+
+    # blank lines are skipped, as DictReader did
+    total_rows = 0
+    for row in reader:
+        if not row:
+            continue
+        total_rows += 1
+        idx = total_rows + 1  # header is line 1
+        if len(row) < width:
+            row += pad[len(row):]
         try:
-            name = _clean(row.get(field_map["name"], ""))
-            usn = _clean(row.get(field_map["usn"], ""))
-            branch = _clean(row.get(field_map["branch"], ""))
+            name = row[i_name].strip()
+            usn = row[i_usn].strip()
+            branch = row[i_branch].strip()
 
-            passout_year = int(_clean(row.get(field_map["passout_year"], "")))
-            admitted_year = int(_clean(row.get(field_map["admitted_year"], "")))
+            passout_year = int(row[i_passout].strip())
+            admitted_year = int(row[i_admitted].strip())
 
             # Optional fields
-            email = ""
-            if "email" in headers:
-                email = _clean(row.get(field_map["email"], "")).lower()
-
-            stype_raw = ""
-            if "student_type" in headers:
-                stype_raw = _clean(row.get(field_map["student_type"], "")).upper()
+            email = row[i_email].strip().lower() if i_email is not None else ""
+            stype_raw = row[i_stype].strip().upper() if i_stype is not None else ""
 
             if not name or not usn or not branch:
                 raise ValueError("name/usn/branch cannot be empty")
 
-            # ✅ duplicates within same college
-            dup = (usn in existing_usns) or (email and email in existing_emails)
-            if dup:
+            if usn in seen_usns or (email and email in seen_emails):
                 if skip_duplicates:
                     skipped += 1
                     continue
-                raise ValueError("Duplicate USN/email in this college")
+                raise ValueError("Duplicate USN/email within this CSV")
+            seen_usns.add(usn)
+            if email:
+                seen_emails.add(email)
 
-            stype = _parse_student_type(stype_raw)
+            stype = _STYPE_MAP.get(stype_raw, StudentType.REGULAR)
             required_points = _required_points_for_type(stype)
 
-            s = Student(
+            parsed.append((idx, dict(
                 college=faculty_college,  # ✅ enforced
                 name=name,
                 usn=usn,
@@ -221,18 +314,65 @@ async def create_students_from_csv(
 
                 # ✅ Mentor
                 created_by_faculty_id=faculty_id,
-            )
-            db.add(s)
-            inserted += 1
-
-            # update sets
-            existing_usns.add(usn)
-            if email:
-                existing_emails.add(email)
+            )))
 
         except Exception as e:
             invalid += 1
-            errors.append(f"Row {idx}: {str(e)}")
+            row_errors.append((idx, f"Row {idx}: {str(e)}"))
+
+    # Pass 2: probe only the USNs/emails present in this CSV (not the whole college)
+    csv_usns = list(seen_usns)
+    csv_emails = list(seen_emails)
+    # one set keyed "u:<usn>" / "e:<email>" so each row probes a single table
+    existing_keys: set[str] = set()
+    if parsed:
+        existing_rows = (
+            await db.execute(
+                select(Student.usn, Student.email).where(
+                    Student.college == faculty_college,
+                    or_(
+                        Student.usn == any_(bindparam("csv_usns", csv_usns, type_=ARRAY(String))),
+                        func.lower(Student.email) == any_(bindparam("csv_emails", csv_emails, type_=ARRAY(String))),
+                    ),
+                )
+            )
+        ).all()
+        for u, e in existing_rows:
+            if u:
+                existing_keys.add("u:" + u)
+            if e:
+                existing_keys.add("e:" + str(e).lower())
+
+    # Pass 3: drop rows that already exist in the DB
+    # validated rows, written with one executemany INSERT / COPY below
+    to_insert: List[dict] = []
+    for idx, r in parsed:
+        usn, email = r["usn"], r["email"]
+
+        # ✅ duplicates within same college
+        if ("u:" + usn in existing_keys) or (email and "e:" + email in existing_keys):
+            if skip_duplicates:
+                skipped += 1
+                continue
+            invalid += 1
+            row_errors.append((idx, f"Row {idx}: Duplicate USN/email in this college"))
+            continue
+
+        to_insert.append(r)
+        inserted += 1
 
+    row_errors.sort(key=lambda e: e[0])
+    errors.extend(msg for _, msg in row_errors)
+
+    if len(to_insert) >= COPY_THRESHOLD:
+        await _copy_students(db, to_insert)
+    elif to_insert:
+        # Core table insert: no ORM bulk-insert bookkeeping, nothing enters the identity map
+        await db.execute(insert(Student.__table__), to_insert)
+    # single commit: the whole CSV stays atomic
     await db.commit()
+
+    # ✅ Welcome emails only after the rows are durable
+    _queue_welcome_emails([(r["email"], r["name"]) for r in to_insert if r["email"]])
+
     return (total_rows, inserted, skipped, invalid, errors)
\ No newline at end of file
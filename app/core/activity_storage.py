@@ -2,45 +2,59 @@ import os
 import uuid
 import logging
 from io import BytesIO
+from typing import BinaryIO
 from fastapi import HTTPException
 from fastapi.concurrency import run_in_threadpool
 
-from app.core.minio_client import get_minio, ensure_bucket
+from app.core.minio_client import get_minio, ensure_bucket, PUT_PART_SIZE
 
 logger = logging.getLogger(__name__)
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 
+_EXT_BY_TYPE = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+# Resolved once at import (main.py loads .env before importing the app)
+MINIO_BUCKET_ACTIVITIES = os.getenv("MINIO_BUCKET_ACTIVITIES", "vikasana-activities").strip()
+MINIO_PUBLIC_BASE = os.getenv("MINIO_PUBLIC_BASE", "").rstrip("/").strip()
+
 
 async def upload_activity_image(
-    file_bytes: bytes,
+    file_bytes: bytes | None,
     content_type: str,
     filename: str,
     student_id: int,
     session_id: int,
+    *,
+    stream: BinaryIO | None = None,
+    length: int | None = None,
 ) -> str:
     """
     Upload activity image to MinIO under:
     activities/{student_id}/{session_id}/{uuid}.ext
+
+    Pass either `file_bytes`, or `stream` + `length` (e.g. UploadFile.file /
+    UploadFile.size) to hand the spooled upload to MinIO without first
+    reading it into memory.
     """
 
     try:
-        if not file_bytes:
+        size = length if stream is not None else len(file_bytes or b"")
+        if not size:
             raise HTTPException(status_code=400, detail="Empty image file")
 
         content_type = (content_type or "application/octet-stream").lower().strip()
         if content_type not in ALLOWED_IMAGE_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported image type: {content_type}")
 
-        bucket = os.getenv("MINIO_BUCKET_ACTIVITIES", "vikasana-activities").strip()
-        public_base = os.getenv("MINIO_PUBLIC_BASE", "").rstrip("/").strip()
+        bucket = MINIO_BUCKET_ACTIVITIES
+        public_base = MINIO_PUBLIC_BASE
 
-        ext_map = {
-            "image/jpeg": "jpg",
-            "image/png": "png",
-            "image/webp": "webp",
-        }
-        ext = ext_map.get(content_type, "jpg")
+        ext = _EXT_BY_TYPE.get(content_type, "jpg")
 
         object_name = f"activities/{student_id}/{session_id}/{uuid.uuid4().hex}.{ext}"
 
@@ -48,7 +62,7 @@ async def upload_activity_image(
             "upload_activity_image start bucket=%s object=%s bytes=%s content_type=%s",
             bucket,
             object_name,
-            len(file_bytes),
+            size,
             content_type,
         )
 
@@ -57,13 +71,14 @@ async def upload_activity_image(
                 minio = get_minio()
                 ensure_bucket(minio, bucket)
 
-                data = BytesIO(file_bytes)
+                data = stream if stream is not None else BytesIO(file_bytes)
                 minio.put_object(
                     bucket_name=bucket,
                     object_name=object_name,
                     data=data,
-                    length=len(file_bytes),
+                    length=size,
                     content_type=content_type,
+                    part_size=PUT_PART_SIZE,
                 )
 
                 if public_base:
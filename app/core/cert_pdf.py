@@ -1,6 +1,9 @@
 # app/core/cert_pdf.py
 import io
-import qrcode
+import os
+from functools import lru_cache
+
+import segno
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
@@ -8,6 +11,26 @@ from reportlab.lib.utils import ImageReader
 from pypdf import PdfReader, PdfWriter
 
 
+@lru_cache(maxsize=1024)
+def _qr_png(verify_url: str) -> bytes:
+    """PNG bytes for the verify QR (segno writes PNG directly, no PIL)."""
+    buf = io.BytesIO()
+    segno.make(verify_url, error="l").save(buf, kind="png", scale=3, border=1)
+    return buf.getvalue()
+
+
+# Invariant overlay layout (points); only the per-certificate strings and
+# the QR image change between calls.
+_MARGIN = 22 * mm
+_TITLE_DY = 95 * mm
+_META_DY = 65 * mm
+_BODY_DY = 120 * mm
+_LINE_STEP = 10 * mm
+_QR_SIZE = 30 * mm
+_QR_Y = 22 * mm
+_QR_CAPTION_Y = 18 * mm
+
+
 def _make_overlay_pdf(
     *,
     certificate_no: str,
@@ -22,20 +45,22 @@ def _make_overlay_pdf(
 ) -> bytes:
     """Creates a transparent overlay PDF with text + QR only."""
     buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=page_size)
+    # Uncompressed: pypdf decodes the overlay stream again to merge it,
+    # so deflating it here is a wasted zlib round trip.
+    c = canvas.Canvas(buf, pagesize=page_size, pageCompression=0)
     w, h = page_size
 
     # Title
     c.setFont("Times-Bold", 28)
-    c.drawCentredString(w / 2, h - 95 * mm, "CERTIFICATE")
+    c.drawCentredString(w / 2, h - _TITLE_DY, "CERTIFICATE")
 
     # Certificate number + date
     c.setFont("Times-Roman", 11)
-    c.drawString(22 * mm, h - 65 * mm, f"Certificate No: {certificate_no}")
-    c.drawRightString(w - 22 * mm, h - 65 * mm, f"Date: {issue_date}")
+    c.drawString(_MARGIN, h - _META_DY, f"Certificate No: {certificate_no}")
+    c.drawRightString(w - _MARGIN, h - _META_DY, f"Date: {issue_date}")
 
     # Main text (center)
-    y = h - 120 * mm
+    y = h - _BODY_DY
     lines = [
         "This is to certify that",
         f"{student_name} (USN: {usn})",
@@ -48,29 +73,32 @@ def _make_overlay_pdf(
     for i, line in enumerate(lines):
         bold = i in (1, 3)  # student line + activity line bold
         c.setFont("Times-Bold" if bold else "Times-Roman", 16 if bold else 13)
-        c.drawCentredString(w / 2, y - i * 10 * mm, line)
+        c.drawCentredString(w / 2, y - i * _LINE_STEP, line)
 
     # QR (bottom-right above footer)
-    qr = qrcode.QRCode(box_size=3, border=1)
-    qr.add_data(verify_url)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    qr_buf = io.BytesIO()
-    img.save(qr_buf, format="PNG")
-    qr_buf.seek(0)
-
-    qr_size = 30 * mm
-    qr_img = ImageReader(qr_buf)
-    c.drawImage(qr_img, w - 22 * mm - qr_size, 22 * mm, qr_size, qr_size, mask="auto")
+    qr_img = ImageReader(io.BytesIO(_qr_png(verify_url)))
+    c.drawImage(qr_img, w - _MARGIN - _QR_SIZE, _QR_Y, _QR_SIZE, _QR_SIZE, mask="auto")
 
     c.setFont("Times-Roman", 8)
-    c.drawRightString(w - 22 * mm, 18 * mm, "Scan QR to verify")
+    c.drawRightString(w - _MARGIN, _QR_CAPTION_Y, "Scan QR to verify")
 
     c.save()
     return buf.getvalue()
 
 
+@lru_cache(maxsize=8)
+def _load_template(path: str, mtime: float) -> tuple[bytes, float, float]:
+    """
+    Template bytes + page-1 size, cached per (path, mtime) so an edited
+    template is picked up. Bytes (not the PdfReader) are cached because
+    merge_page mutates the page it merges into.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    box = PdfReader(io.BytesIO(data)).pages[0].mediabox
+    return data, float(box.width), float(box.height)
+
+
 def build_certificate_pdf(
     *,
     template_pdf_path: str,   # ✅ path to your template PDF
@@ -87,12 +115,10 @@ def build_certificate_pdf(
     Loads the template PDF and merges an overlay (text+QR) onto page 1.
     Returns final PDF bytes.
     """
-    template_reader = PdfReader(template_pdf_path)
-    template_page = template_reader.pages[0]
+    template_bytes, w, h = _load_template(template_pdf_path, os.path.getmtime(template_pdf_path))
+    template_page = PdfReader(io.BytesIO(template_bytes)).pages[0]
 
-    # Use the template page size so overlay matches perfectly
-    w = float(template_page.mediabox.width)
-    h = float(template_page.mediabox.height)
+    # (w, h) is the template page size so overlay matches perfectly
 
     overlay_bytes = _make_overlay_pdf(
         certificate_no=certificate_no,
@@ -2,23 +2,45 @@ import hmac
 import hashlib
 from app.core.config import settings
 
+# Keyed once at import; the legacy path clones the prepared ipad/opad state
+_KEY = settings.CERT_SIGNING_SECRET.encode("utf-8")
+_HMAC_TEMPLATE = hmac.new(_KEY, None, hashlib.sha256)
+
+# New signatures: keyed BLAKE2b (single pass, native MAC), version-prefixed
+_B2_PREFIX = "b2$"
+_B2_KEY = _KEY[:64]  # blake2b key limit
+
+
+def _sign_hmac(cert_id: str) -> str:
+    h = _HMAC_TEMPLATE.copy()
+    h.update(str(cert_id).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _sign_b2(cert_id: str) -> str:
+    return hashlib.blake2b(str(cert_id).encode("utf-8"), key=_B2_KEY, digest_size=32).hexdigest()
+
 
 def sign_cert(cert_id: str) -> str:
     """
     Sign certificate identifier (prefer certificate_no string).
     Always treat as string.
     """
-    key = settings.CERT_SIGNING_SECRET.encode("utf-8")
-    msg = str(cert_id).encode("utf-8")
-    return hmac.new(key, msg, hashlib.sha256).hexdigest()
+    return _B2_PREFIX + _sign_b2(cert_id)
 
 
 def verify_sig(cert_id: str, sig: str) -> bool:
     """
-    Verify HMAC signature safely.
+    Verify signature safely.
+    "b2$..." -> keyed BLAKE2b; anything else -> legacy HMAC-SHA256
+    (QR codes on already-issued certificates keep verifying).
     """
     if not sig:
         return False
 
-    expected = sign_cert(cert_id)
-    return hmac.compare_digest(expected, sig)
\ No newline at end of file
+    if sig.startswith(_B2_PREFIX):
+        expected = _sign_b2(cert_id)
+        sig = sig[len(_B2_PREFIX):]
+    else:
+        expected = _sign_hmac(cert_id)
+    return hmac.compare_digest(expected, sig)
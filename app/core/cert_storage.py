@@ -7,6 +7,8 @@ from datetime import timedelta
 from minio import Minio
 from minio.error import S3Error
 
+from app.core.minio_client import PUT_PART_SIZE
+
 
 def _env(name: str) -> str:
     v = os.getenv(name)
@@ -35,12 +37,19 @@ _minio = Minio(
 )
 
 
+_bucket_ready = False
+
+
 def ensure_bucket() -> None:
+    global _bucket_ready
+    if _bucket_ready:
+        return
     try:
         if not _minio.bucket_exists(MINIO_BUCKET_CERTIFICATES):
             _minio.make_bucket(MINIO_BUCKET_CERTIFICATES)
     except S3Error as e:
         raise RuntimeError(f"MinIO bucket ensure failed: {e}") from e
+    _bucket_ready = True
 
 
 def build_object_key(cert_id: int) -> str:
@@ -68,6 +77,7 @@ def upload_certificate_pdf_bytes(cert_id: int, pdf_bytes: bytes) -> str:
             data=data,
             length=size,
             content_type="application/pdf",
+            part_size=PUT_PART_SIZE,
         )
     except S3Error as e:
         raise RuntimeError(f"MinIO put_object failed: {e}") from e
@@ -1,4 +1,4 @@
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +22,17 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_SYNC_URL: str
 
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Monitoring: statements slower than this are logged; pool occupancy is
+    # logged every DB_POOL_STATS_INTERVAL seconds (0 disables)
+    DB_SLOW_QUERY_MS: int = 500
+    DB_POOL_STATS_INTERVAL: int = 60
+
     # ─────────────────────────────────────────────────────
     # JWT
     # ─────────────────────────────────────────────────────
@@ -29,6 +40,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # ─────────────────────────────────────────────────────
+    # Password hashing (bcrypt work factor, tune per deployment)
+    # ─────────────────────────────────────────────────────
+    BCRYPT_COST: int = 12
+
     # ─────────────────────────────────────────────────────
     # CORS
     # ─────────────────────────────────────────────────────
@@ -85,6 +101,9 @@ class Settings(BaseSettings):
     SENDINBLUE_API_KEY: str = ""
     EMAIL_FROM: str = "admin@vikasana.org"
     EMAIL_FROM_NAME: str = "Vikasana Foundation"
+    EMAIL_TEST_DOMAINS: str = ""  # comma-separated; logged, never sent (e.g. "example.com,test.invalid")
+    EMAIL_TRANSPORT: str = "brevo"  # "log" = log instead of calling Brevo
+    EMAIL_GZIP: bool = False  # gzip request bodies to Brevo (opt-in; falls back if rejected)
 
     # ─────────────────────────────────────────────────────
     # Faculty Activation
@@ -100,11 +119,16 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        # read once per process: immutable, exact-case env lookups,
+        # defaults trusted as written (no validator pass over them)
+        frozen=True,
+        case_sensitive=True,
+        validate_default=False,
     )
 
-    @property
-    def origins_list(self) -> list[str]:
-        return [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
+    @cached_property
+    def origins_list(self) -> tuple[str, ...]:
+        return tuple(o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip())
 
 
 @lru_cache()
@@ -1,23 +1,139 @@
 # app/core/database.py
 
+import asyncio
+import logging
+import time
+
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
 
 # ───────────────── ENGINE ─────────────────
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-)
+POOL_SIZE = settings.DB_POOL_SIZE
+
+# Serverless / many short-lived workers: don't hold idle connections per
+# process, let PgBouncer (transaction mode) do the pooling instead.
+SERVERLESS = settings.APP_ENV.strip().lower() in {"serverless", "lambda"}
+
+if SERVERLESS:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        poolclass=NullPool,
+        connect_args={
+            # transaction-mode PgBouncer can't keep prepared statements,
+            # and pre_ping is pointless without a pool
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "server_settings": {"jit": "off"},
+        },
+    )
+else:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_size=POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # pre_ping on checkout: cached-auth and unauthenticated requests may
+        # run no guard query at all, so a stale connection (after a Postgres
+        # restart or firewall drop) must be caught before any route uses it
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={
+            # prepared-statement caches (asyncpg's own + SQLAlchemy's per-connection
+            # one, default 100): the repetitive auth/lookup SELECTs become bind+execute
+            "statement_cache_size": 2048,
+            "prepared_statement_cache_size": 2048,
+            # short OLTP queries never benefit from JIT compilation
+            "server_settings": {"jit": "off"},
+        },
+    )
+
+
+async def warm_pool() -> None:
+    """
+    Eagerly open POOL_SIZE connections so the first burst of requests
+    (CSV import + OTP traffic) does not pay the asyncpg connect cost.
+    Connections are held until all are open, otherwise the pool would hand
+    back the same one each time.
+
+    Best effort: if the database is unreachable at boot, log and carry on;
+    the pool then connects lazily as before.
+    """
+    if SERVERLESS:
+        return  # NullPool: nothing to warm
+    conns = []
+    try:
+        for _ in range(POOL_SIZE):
+            conns.append(await engine.connect())
+    except Exception as e:
+        db_logger.warning("DB pool warm-up stopped after %d connection(s): %r", len(conns), e)
+    finally:
+        for conn in conns:
+            await conn.close()  # back to the pool, still open
+
+
+# ───────────────── MONITORING ─────────────────
+# Slow statements and periodic pool occupancy go to the log, so pool sizing
+# (DB_POOL_SIZE / DB_MAX_OVERFLOW) can be checked against real load.
+
+db_logger = logging.getLogger("app.db")
+
+SLOW_QUERY_SECONDS = settings.DB_SLOW_QUERY_MS / 1000
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started_at
+    if elapsed >= SLOW_QUERY_SECONDS:
+        db_logger.warning("Slow query %.1fms: %s", elapsed * 1000, statement[:500])
+
+
+_pool_monitor: asyncio.Task | None = None
+
+
+async def _sample_pool(interval: float) -> None:
+    pool = engine.pool
+    while True:
+        await asyncio.sleep(interval)
+        db_logger.info(
+            "DB pool: checked_out=%s overflow=%s idle=%s",
+            pool.checkedout(), pool.overflow(), pool.checkedin(),
+        )
+
+
+def start_pool_monitor() -> None:
+    global _pool_monitor
+    if SERVERLESS or settings.DB_POOL_STATS_INTERVAL <= 0:
+        return  # NullPool has no occupancy to report
+    if _pool_monitor is None or _pool_monitor.done():
+        _pool_monitor = asyncio.create_task(_sample_pool(settings.DB_POOL_STATS_INTERVAL))
+
+
+async def stop_pool_monitor() -> None:
+    global _pool_monitor
+    if _pool_monitor is None:
+        return
+    _pool_monitor.cancel()
+    try:
+        await _pool_monitor
+    except asyncio.CancelledError:
+        pass
+    _pool_monitor = None
 
 
 # ───────────────── SESSION ─────────────────
@@ -31,6 +147,26 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# Track whether a session has written anything since its last commit, so
+# get_db only issues COMMIT for requests that actually mutated data.
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session):
+    session.info.pop("has_writes", None)
+
+
 # ───────────────── BASE ─────────────────
 
 class Base(DeclarativeBase):
@@ -43,7 +179,10 @@ async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            # commit on demand: read-only requests skip the COMMIT and the
+            # connection is simply released (reset) back to the pool
+            if session.info.get("has_writes") or session.new or session.dirty or session.deleted:
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
\ No newline at end of file
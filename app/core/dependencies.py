@@ -1,166 +1,326 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+from jwt import PyJWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select, bindparam
+from sqlalchemy.orm import Session, defer, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token_cached
 from app.models.admin import Admin
 from app.models.faculty import Faculty
 from app.models.student import Student
 
-bearer = HTTPBearer(auto_error=False)
-
-
-def _not_authenticated_exception() -> HTTPException:
-    return HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or missing token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-
-async def get_current_admin(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
-    db: AsyncSession = Depends(get_db),
-) -> Admin:
-    not_authenticated = _not_authenticated_exception()
-
-    if not credentials:
-        raise not_authenticated
-
-    try:
-        payload = decode_access_token(credentials.credentials)
-        admin_id = int(payload["sub"])
-
-        # ✅ admin tokens require this
-        if payload.get("type") != "access":
-            raise not_authenticated
-
-    except (JWTError, KeyError, ValueError):
-        raise not_authenticated
+class _BearerToken(HTTPBearer):
+    """
+    "Authorization: Bearer <token>" -> "<token>", else None.
+    Same result as HTTPBearer(auto_error=False), minus the regex/scheme
+    parsing and the HTTPAuthorizationCredentials allocation. Subclassing
+    keeps the scheme registered in OpenAPI (Swagger "Authorize").
+    """
 
-    result = await db.execute(select(Admin).where(Admin.id == admin_id))
-    admin = result.scalar_one_or_none()
+    async def __call__(self, request: Request) -> str | None:
+        authorization = request.headers.get("authorization")
+        if not authorization or authorization[:7].lower() != "bearer ":
+            return None
+        return authorization[7:].strip() or None
 
-    if admin is None:
-        raise not_authenticated
 
-    if not admin.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This admin account has been deactivated",
-        )
+bearer_token = _BearerToken(scheme_name="HTTPBearer", auto_error=False)
 
-    return admin
 
+@dataclass(slots=True)
+class Principal:
+    """Authenticated caller for routes that only need to know who it is."""
+    id: int
+    role: str
+    is_active: bool = True
 
-async def get_current_faculty(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
-    db: AsyncSession = Depends(get_db),
-) -> Faculty:
-    not_authenticated = _not_authenticated_exception()
 
-    if not credentials:
-        raise not_authenticated
+# ───────────────── PRINCIPAL CACHE ─────────────────
+# Short-lived snapshot of active admin/faculty/student rows keyed by
+# (role, token sub). A hit rebuilds a fresh *detached* instance, so it is
+# never shared between requests and never enters the request's session:
+# any later select of the same row in the route loads it fresh from the DB.
+#
+# Writes through any session (ORM flushes and bulk UPDATE/DELETE) drop the
+# affected entries on commit; see _collect_principal_writes below.
+# NOTE: the cache is per process. Invalidation only reaches the worker that
+# committed the write; other workers may serve the old snapshot (including a
+# deactivated or deleted account) until PRINCIPAL_CACHE_TTL runs out. Routes
+# that must show current values (e.g. /me) read the row fresh instead.
 
-    try:
-        payload = decode_access_token(credentials.credentials)
-        faculty_id = int(payload["sub"])
+PRINCIPAL_CACHE_TTL = 30.0
+PRINCIPAL_CACHE_MAXSIZE = 10_000
+
+
+class _CacheEntry:
+    __slots__ = ("model", "values", "expires_at")
+
+    def __init__(self, model: type, values: dict[str, Any], expires_at: float):
+        self.model = model
+        self.values = values
+        self.expires_at = expires_at
 
-        # ✅ faculty tokens require this
-        if payload.get("type") != "access":
-            raise not_authenticated
 
-        # ✅ optional role enforcement
-        role = payload.get("role")
-        if role and role != "faculty":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized as faculty",
-            )
+_principal_cache: dict[tuple[str, Any], _CacheEntry] = {}
 
-    except (JWTError, KeyError, ValueError):
-        raise not_authenticated
 
-    result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-    faculty = result.scalar_one_or_none()
+def _snapshot(obj, *, nested: bool = True) -> dict[str, Any]:
+    state = inspect(obj)
+    mapper = state.mapper
+    loaded = state.dict
+    # only what is already loaded: never trigger IO from here
+    values = {a.key: loaded[a.key] for a in mapper.column_attrs if a.key in loaded}
+    if nested:
+        # keep already-loaded many-to-one relations (e.g. Student.created_by_faculty)
+        for rel in mapper.relationships:
+            if not rel.uselist and rel.key in loaded:
+                target = loaded[rel.key]
+                values[rel.key] = (
+                    None if target is None
+                    else _CacheEntry(type(target), _snapshot(target, nested=False), 0.0)
+                )
+    return values
 
-    if faculty is None:
-        raise not_authenticated
 
-    if hasattr(faculty, "is_active") and not faculty.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This faculty account has been deactivated",
-        )
+def _rebuild(model: type, values: dict[str, Any]):
+    obj = model.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        if isinstance(value, _CacheEntry):
+            value = _rebuild(value.model, value.values)
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return obj
 
-    return faculty
 
+def _cache_get(role: str, key: Any):
+    entry = _principal_cache.get((role, key))
+    if entry is None:
+        return None
+    if entry.expires_at < time.monotonic():
+        _principal_cache.pop((role, key), None)
+        return None
+    return _rebuild(entry.model, entry.values)
 
-async def get_current_student(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
-    db: AsyncSession = Depends(get_db),
-) -> Student:
-    """
-    Student auth guard dependency.
 
-    ✅ Supports BOTH token styles:
-    A) Current student OTP token (your current system):
-       payload["sub"] = student_email
-       payload["role"] = "student"
-       (no payload["type"])
+def _cache_fresh(role: str, key: Any) -> bool:
+    entry = _principal_cache.get((role, key))
+    return entry is not None and entry.expires_at >= time.monotonic()
 
-    B) Future improved token style:
-       payload["sub"] = student_id (numeric string)
-       payload["type"] = "access"
-       payload["role"] = "student"
 
-    We enforce role when present.
-    We DO NOT require 'type' for student tokens (to match your current token).
-    """
+def _cache_put(role: str, key: Any, obj) -> None:
+    now = time.monotonic()
+    if len(_principal_cache) >= PRINCIPAL_CACHE_MAXSIZE:
+        for k in [k for k, e in _principal_cache.items() if e.expires_at < now]:
+            del _principal_cache[k]
+        if len(_principal_cache) >= PRINCIPAL_CACHE_MAXSIZE:
+            _principal_cache.clear()
+    _principal_cache[(role, key)] = _CacheEntry(type(obj), _snapshot(obj), now + PRINCIPAL_CACHE_TTL)
 
-    not_authenticated = _not_authenticated_exception()
 
-    if not credentials:
-        raise not_authenticated
+def invalidate_principal(role: str, *keys: Any) -> None:
+    """Drop cached principals, e.g. after deleting or deactivating an account."""
+    for key in keys:
+        _principal_cache.pop((role, key), None)
 
-    try:
-        payload = decode_access_token(credentials.credentials)
 
-        role = payload.get("role")
-        if role and role != "student":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized as student",
-            )
+_PRINCIPAL_ROLES: dict[type, str] = {Admin: "admin", Faculty: "faculty", Student: "student"}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_writes(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    for obj in (*session.dirty, *session.deleted):
+        role = _PRINCIPAL_ROLES.get(type(obj))
+        if role is not None:
+            session.info.setdefault("principal_writes", set()).add((role, obj.id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_principal_bulk_writes(orm_execute_state):
+    # update(Student)/delete(Faculty)...: rows unknown, drop the whole role
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        role = mapper is not None and _PRINCIPAL_ROLES.get(mapper.class_)
+        if role:
+            orm_execute_state.session.info.setdefault("principal_writes", set()).add((role, None))
 
-        sub = payload.get("sub")
-        if not sub:
-            raise not_authenticated
 
-        sub = str(sub).strip()
-
-    except (JWTError, KeyError, ValueError):
-        raise not_authenticated
+@event.listens_for(Session, "after_commit")
+def _invalidate_principal_writes(session):
+    # on commit, not flush: a concurrent request re-caching between the two
+    # would otherwise pin the pre-commit values for a full TTL
+    for role, key in session.info.pop("principal_writes", ()):
+        if key is None:
+            for k in [k for k in _principal_cache if k[0] == role]:
+                _principal_cache.pop(k, None)
+        else:
+            _principal_cache.pop((role, key), None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_writes(session):
+    session.info.pop("principal_writes", None)
+
+
+# Built per raise, never shared: a raised exception keeps its __traceback__
+# (and with it every frame's locals), so a module-level instance would pin
+# the last failing request's frames and grow its chain on every raise.
+def not_authenticated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-    # ✅ If sub is numeric -> treat as student_id
-    if sub.isdigit():
-        result = await db.execute(select(Student).where(Student.id == int(sub)))
-    else:
-        # ✅ Otherwise treat sub as email (your current token)
-        result = await db.execute(select(Student).where(Student.email == sub))
 
-    student = result.scalar_one_or_none()
+def _forbidden(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
-    if student is None:
-        raise not_authenticated
 
-    if hasattr(student, "is_active") and not student.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This student account has been deactivated",
-        )
+def _auth_dep(
+    model: type,
+    role: str,
+    *,
+    deferred: tuple = (),
+    principal_only: bool = False,
+    not_role_detail: str,
+    deactivated_detail: str,
+):
+    """
+    Build a get_current_<role> dependency. All three guards share one code
+    object; the per-role differences are closure constants.
 
-    return student
\ No newline at end of file
+    principal_only=True builds the light variant: it checks the same token
+    and account state but selects only (id, is_active) as a plain row and
+    returns a Principal instead of hydrating the ORM object.
+    """
+    # resolved once per model (Student has no is_active column)
+    check_active = hasattr(model, "is_active")
+
+    # never needed by a guard or by routes using the principal: keep them off the wire.
+    # Built on first use: loader options configure the mappers, which must wait
+    # until every model module has been imported.
+    load_opts = None
+    light_stmt = None  # (id, is_active) select for principal_only, also built lazily
+
+    async def dependency(
+        token: str | None = Depends(bearer_token),
+        db: AsyncSession = Depends(get_db),
+    ):
+        if not token:
+            raise not_authenticated()
+
+        try:
+            payload = decode_access_token_cached(token)
+
+            # ✅ every principal token is type="access" with a numeric sub (the row id)
+            if payload.get("type") != "access":
+                raise not_authenticated()
+
+            # ✅ role enforcement: a token that carries a role must carry this one.
+            # Never optional: student tokens also have a numeric sub, so without
+            # it a student id would authenticate as the admin with that id.
+            token_role = payload.get("role")
+            if token_role and token_role != role:
+                raise _forbidden(not_role_detail)
+
+            key = int(payload["sub"])
+
+        except (PyJWTError, KeyError, ValueError):
+            raise not_authenticated()
+
+        if principal_only:
+            nonlocal light_stmt
+            if not _cache_fresh(role, key):
+                if light_stmt is None:
+                    light_stmt = select(model.id, *((model.is_active,) if check_active else ())).where(
+                        model.id == bindparam("id")
+                    )
+                row = (await db.execute(light_stmt, {"id": key})).first()
+                if row is None:
+                    raise not_authenticated()
+                if check_active and not row.is_active:
+                    invalidate_principal(role, key)
+                    raise _forbidden(deactivated_detail)
+            return Principal(id=key, role=role)
+
+        cached = _cache_get(role, key)
+        if cached is not None:
+            return cached
+
+        nonlocal load_opts
+        if load_opts is None:
+            load_opts = [defer(col) for col in deferred]
+
+        principal = await db.get(model, key, options=load_opts)
+
+        if principal is None:
+            raise not_authenticated()
+
+        if check_active and not principal.is_active:
+            invalidate_principal(role, key)
+            raise _forbidden(deactivated_detail)
+
+        _cache_put(role, key, principal)
+        return principal
+
+    dependency.__name__ = dependency.__qualname__ = (
+        f"get_{role}_principal" if principal_only else f"get_current_{role}"
+    )
+    return dependency
+
+
+# Admin: admin tokens carry no role claim, but any token that does carry one
+# (e.g. a student token, whose sub is also a numeric id) must say "admin".
+get_current_admin = _auth_dep(
+    Admin,
+    "admin",
+    deferred=(Admin.password_hash,),
+    not_role_detail="Not authorized as admin",
+    deactivated_detail="This admin account has been deactivated",
+)
+
+# Faculty: role must be "faculty" when present.
+get_current_faculty = _auth_dep(
+    Faculty,
+    "faculty",
+    deferred=(Faculty.password_hash, Faculty.activation_token_hash),
+    not_role_detail="Not authorized as faculty",
+    deactivated_detail="This faculty account has been deactivated",
+)
+
+# Student: role must be "student" when present. Tokens issued before the
+# sub=id contract (sub=email, no type) are rejected; they expire within
+# ACCESS_TOKEN_EXPIRE_MINUTES anyway and the student simply logs in again.
+get_current_student = _auth_dep(
+    Student,
+    "student",
+    not_role_detail="Not authorized as student",
+    deactivated_detail="This student account has been deactivated",
+)
+
+
+# Light guards: same checks, no ORM object. For routes that only need the
+# caller's id (or nothing beyond "is an active admin/student").
+get_admin_principal = _auth_dep(
+    Admin,
+    "admin",
+    principal_only=True,
+    not_role_detail="Not authorized as admin",
+    deactivated_detail="This admin account has been deactivated",
+)
+
+get_student_principal = _auth_dep(
+    Student,
+    "student",
+    principal_only=True,
+    not_role_detail="Not authorized as student",
+    deactivated_detail="This student account has been deactivated",
+)
@@ -0,0 +1,116 @@
+# app/core/email_queue.py
+#
+# In-process outbound email queue.
+# Controllers enqueue a send_* call and return immediately; a small pool of
+# background workers drains the queue, shares one token bucket to respect
+# the provider rate limit, and retries transient failures with backoff.
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RATE_PER_SEC = 10
+EMAIL_QUEUE_MAXSIZE = 1000
+EMAIL_WORKERS = 8
+EMAIL_MAX_RETRIES = 3          # retries after the first attempt: 1s, 2s, 4s, or longer if asked
+EMAIL_RETRY_BASE_DELAY = 1.0
+EMAIL_DRAIN_TIMEOUT = 10.0     # seconds to flush pending mail on shutdown
+
+SendFn = Callable[..., Awaitable[None]]
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_queue: asyncio.Queue[tuple[SendFn, dict[str, Any]]] | None = None
+_workers: list[asyncio.Task] = []
+
+
+def _get_queue() -> asyncio.Queue:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=EMAIL_QUEUE_MAXSIZE)
+    return _queue
+
+
+async def _send_with_retry(bucket: TokenBucket, send_fn: SendFn, kwargs: dict[str, Any]) -> None:
+    """
+    Callers no longer observe failures, so transient ones (errors flagged
+    `retryable`, e.g. network errors / 429 / 503) are retried here. An error's
+    `retry_after` (e.g. an open circuit breaker's remaining cooldown) stretches
+    the backoff, so mail queued during an outage outlives the cooldown.
+    """
+    for attempt in range(EMAIL_MAX_RETRIES + 1):
+        await bucket.acquire()
+        try:
+            await send_fn(**kwargs)
+            return
+        except Exception as e:
+            if attempt == EMAIL_MAX_RETRIES or not getattr(e, "retryable", False):
+                raise
+            backoff = EMAIL_RETRY_BASE_DELAY * (2 ** attempt)
+            await asyncio.sleep(max(backoff, getattr(e, "retry_after", None) or 0.0))
+
+
+async def _run_worker(bucket: TokenBucket) -> None:
+    queue = _get_queue()
+    while True:
+        send_fn, kwargs = await queue.get()
+        try:
+            await _send_with_retry(bucket, send_fn, kwargs)
+        except Exception:
+            to = kwargs.get("to_email") or f"{len(kwargs.get('recipients') or ())} recipients"
+            logger.exception("Queued email failed: %s to=%s", send_fn.__name__, to)
+        finally:
+            queue.task_done()
+
+
+def enqueue_email(send_fn: SendFn, **kwargs: Any) -> None:
+    """
+    Schedule `await send_fn(**kwargs)` on the background worker.
+    Raises asyncio.QueueFull if the queue is saturated.
+    """
+    _get_queue().put_nowait((send_fn, kwargs))
+
+
+def start_email_worker() -> None:
+    global _workers
+    if _workers and not all(w.done() for w in _workers):
+        return
+    bucket = TokenBucket(EMAIL_RATE_PER_SEC)
+    _workers = [asyncio.create_task(_run_worker(bucket)) for _ in range(EMAIL_WORKERS)]
+
+
+async def stop_email_worker() -> None:
+    global _workers
+    if not _workers:
+        return
+    # give already-queued mail a chance to go out before cancelling
+    try:
+        await asyncio.wait_for(_get_queue().join(), EMAIL_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Email queue not drained on shutdown; %d email(s) dropped", _get_queue().qsize())
+    for w in _workers:
+        w.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers = []
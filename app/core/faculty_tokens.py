@@ -6,9 +6,16 @@ from itsdangerous import URLSafeTimedSerializer
 import secrets
 
 
+# Resolved once at import (main.py loads .env before importing the app)
+ACTIVATION_TOKEN_SECRET = os.getenv("ACTIVATION_TOKEN_SECRET", "change-me")
+ACTIVATION_TOKEN_EXPIRE_HOURS = int(os.getenv("ACTIVATION_TOKEN_EXPIRE_HOURS", "48"))
+ACTIVATION_TOKEN_MAX_AGE = ACTIVATION_TOKEN_EXPIRE_HOURS * 3600
+
+_SERIALIZER = URLSafeTimedSerializer(secret_key=ACTIVATION_TOKEN_SECRET, salt="faculty-activation")
+
+
 def _serializer() -> URLSafeTimedSerializer:
-    secret = os.getenv("ACTIVATION_TOKEN_SECRET", "change-me")
-    return URLSafeTimedSerializer(secret_key=secret, salt="faculty-activation")
+    return _SERIALIZER
 
 
 def create_activation_token(email: str) -> str:
@@ -27,8 +34,7 @@ def verify_token(token: str, max_age_seconds: int) -> dict:
 
 
 def activation_expiry_dt() -> datetime:
-    hours = int(os.getenv("ACTIVATION_TOKEN_EXPIRE_HOURS", "48"))
-    return datetime.now(timezone.utc) + timedelta(hours=hours)
+    return datetime.now(timezone.utc) + timedelta(hours=ACTIVATION_TOKEN_EXPIRE_HOURS)
 
 
 def generate_session_id() -> str:
@@ -36,8 +42,7 @@ def generate_session_id() -> str:
 
 def generate_otp() -> str:
     # 6-digit numeric OTP
-    import random
-    return f"{random.randint(0, 999999):06d}"
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 def hash_otp(otp: str) -> str:
     return hashlib.sha256(otp.encode("utf-8")).hexdigest()
@@ -1,19 +1,30 @@
 import os
 import uuid
+from io import BytesIO
 from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
 from app.core.minio_client import get_minio, ensure_bucket
 
+# Resolved once at import (main.py loads .env before importing the app)
+MINIO_BUCKET_FACULTY = os.getenv("MINIO_BUCKET_FACULTY", "vikasana-faculty")
+MINIO_PUBLIC_BASE = os.getenv("MINIO_PUBLIC_BASE", "").rstrip("/")
+
 
 async def upload_faculty_image(file_bytes: bytes, content_type: str, filename: str) -> str:
+    # MinIO SDK is sync; keep its network I/O off the event loop
+    return await run_in_threadpool(_upload_faculty_image, file_bytes, content_type, filename)
+
+
+def _upload_faculty_image(file_bytes: bytes, content_type: str, filename: str) -> str:
     minio = get_minio()
-    bucket = os.getenv("MINIO_BUCKET_FACULTY", "vikasana-faculty")
+    bucket = MINIO_BUCKET_FACULTY
     ensure_bucket(minio, bucket)
 
-    ext = filename.split(".")[-1].lower() if "." in filename else "jpg"
+    ext = os.path.splitext(filename)[1][1:].lower() or "jpg"
     object_name = f"faculty/{uuid.uuid4().hex}.{ext}"
 
-    # MinIO SDK is sync; fine for small images. For huge files, wrap in thread.
-    from io import BytesIO
     data = BytesIO(file_bytes)
 
     minio.put_object(
@@ -24,9 +35,8 @@ async def upload_faculty_image(file_bytes: bytes, content_type: str, filename: s
         content_type=content_type or "application/octet-stream",
     )
 
-    public_base = os.getenv("MINIO_PUBLIC_BASE", "").rstrip("/")
-    if public_base:
-        return f"{public_base}/{bucket}/{object_name}"
+    if MINIO_PUBLIC_BASE:
+        return f"{MINIO_PUBLIC_BASE}/{bucket}/{object_name}"
 
     # fallback presigned
     return minio.presigned_get_object(bucket, object_name)
\ No newline at end of file
@@ -1,10 +1,20 @@
 import os
+from functools import lru_cache
+
 from minio import Minio
 from minio.error import S3Error
 from datetime import timedelta
 
+# Multipart chunk size for put_object; bounds per-part buffering on large objects
+PUT_PART_SIZE = 10 * 1024 * 1024
+
 
+@lru_cache(maxsize=1)
 def get_minio() -> Minio:
+    """
+    Process-wide client: one urllib3 connection pool reused by every call
+    instead of a fresh client (and TCP/TLS handshake) per upload.
+    """
     endpoint = os.getenv("MINIO_ENDPOINT", "127.0.0.1:9000")
     access_key = os.getenv("MINIO_ACCESS_KEY", "")
     secret_key = os.getenv("MINIO_SECRET_KEY", "")
@@ -18,10 +28,17 @@ def get_minio() -> Minio:
     )
 
 
+_known_buckets: set[str] = set()
+
+
 def ensure_bucket(minio: Minio, bucket: str) -> None:
+    # buckets are never deleted at runtime; skip the HEAD once seen
+    if bucket in _known_buckets:
+        return
     found = minio.bucket_exists(bucket)
     if not found:
         minio.make_bucket(bucket)
+    _known_buckets.add(bucket)
 
 
 # ✅ ADD THIS
@@ -1,11 +1,22 @@
+import base64
+import json
+import time
 from datetime import datetime, timedelta, timezone
-from jose import jwt
+from functools import lru_cache
+import jwt
+from jwt import DecodeError, ExpiredSignatureError
 from passlib.context import CryptContext
 from app.core.config import settings
 
 # ── Bcrypt Password Hashing ───────────────────────────────────────────
 # "deprecated=auto" → old hashes are silently re-hashed on next login
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost is fixed once here (BCRYPT_COST in .env) so every hash() call only
+# pays for salt generation + the bcrypt rounds themselves.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_COST,
+)
 
 # Constant-time dummy hash used when no real hash exists,
 # prevents timing attacks that could reveal valid emails.
@@ -71,6 +82,45 @@ def create_access_token(admin_id: int, email: str) -> str:
 def decode_access_token(token: str) -> dict:
     """
     Decodes and verifies JWT signature + expiry.
-    Raises jose.JWTError on any failure.
+    Raises jwt.PyJWTError on any failure.
+
+    Structurally broken or visibly expired tokens are rejected from the
+    unverified payload first, before paying for the HMAC.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise DecodeError("Not enough segments")
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except (ValueError, TypeError):
+        raise DecodeError("Invalid payload segment")
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(exp, (int, float)) and exp < time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+# Verified payloads keyed by (token, 10s bucket): the same bearer token
+# arrives on many requests, so the HMAC check runs once per bucket.
+# Stale buckets simply age out of the LRU.
+_DECODE_BUCKET_SECONDS = 10
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str, now_bucket: int) -> dict:
+    return decode_access_token(token)
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """
+    Same contract as decode_access_token (raises jwt.PyJWTError), but
+    memoised. Expiry is still checked on every call. The returned dict is
+    shared between callers and must be treated as read-only.
     """
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
\ No newline at end of file
+    now = time.time()
+    payload = _decode_cached(token, int(now) // _DECODE_BUCKET_SECONDS)
+    exp = payload.get("exp")
+    if exp is not None and exp < now:
+        raise ExpiredSignatureError("Signature has expired.")
+    return payload
@@ -2,6 +2,8 @@
 
 from dotenv import load_dotenv
 import os
+import logging
+from contextlib import asynccontextmanager
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
@@ -13,6 +15,10 @@ from fastapi.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
 from app.core.config import settings
+from app.core.database import engine, warm_pool, start_pool_monitor, stop_pool_monitor
+from app.core.email_queue import start_email_worker, stop_email_worker
+from app.core.email_service import close_email_client
+from app.models import load_all as load_all_models
 
 # ───────────────── ROUTER IMPORTS ─────────────────
 from app.routes.auth import router as auth_router
@@ -45,6 +51,20 @@ from app.routes.admin_certificates import router as admin_certificates_router
 from app.routes.public_minio import router as public_minio_router
 
 
+# ───────────────── LIFESPAN ─────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_all_models()
+    await warm_pool()
+    start_email_worker()
+    start_pool_monitor()
+    yield
+    await stop_pool_monitor()
+    await stop_email_worker()
+    await close_email_client()
+    await engine.dispose()
+
+
 # ───────────────── APP INIT ─────────────────
 app = FastAPI(
     title="Vikasana Foundation API",
@@ -52,6 +72,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
 
@@ -105,11 +126,14 @@ app.add_middleware(
 
 
 # ───────────────── DEBUG ORIGIN LOGGER (TEMPORARY) ─────────────────
+logger = logging.getLogger("app.origin")
+
+
 @app.middleware("http")
 async def log_origin(request: Request, call_next):
     origin = request.headers.get("origin")
-    if origin:
-        print(f"🌍 ORIGIN: {origin} | PATH: {request.url.path}")
+    if origin and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ORIGIN: %s | PATH: %s", origin, request.url.path)
     response = await call_next(request)
     return response
 
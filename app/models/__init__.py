@@ -1 +1,34 @@
-# intentionally empty to avoid circular imports
+# intentionally no model imports at package import time (avoids circular imports);
+# load_all() registers every mapper explicitly, once, from the app lifespan.
+import importlib
+
+MODEL_MODULES = (
+    "admin",
+    "faculty",
+    "faculty_activation_session",
+    "student",
+    "student_otp_session",
+    "student_point_adjustment",
+    "student_activity_stats",
+    "student_activity_progress",
+    "student_face_embedding",
+    "activity_type",
+    "activity_session",
+    "activity_photo",
+    "activity_face_check",
+    "events",
+    "event_activity_type",
+    "certifcate",
+)
+
+
+def load_all() -> None:
+    """
+    Import every model module, then configure all mappers up front so the
+    first request doesn't pay for resolving string relationships.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    for name in MODEL_MODULES:
+        importlib.import_module(f"app.models.{name}")
+    configure_mappers()
@@ -14,6 +14,7 @@ from sqlalchemy import (
     Boolean,
     Index,
     ForeignKey,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -50,8 +51,17 @@ class Student(Base):
     __table_args__ = (
         # ✅ FIXED: uniqueness per college
         UniqueConstraint("college", "usn", name="uq_students_college_usn"),
-        UniqueConstraint("college", "email", name="uq_students_college_email"),
+        Index(
+            "uq_students_college_lower_email",
+            "college",
+            text("lower(email)"),
+            unique=True,
+            postgresql_where=text("email IS NOT NULL"),
+        ),
         Index("ix_students_college_branch", "college", "branch"),
+        # college lookups + the CSV import preload (index-only scan); replaces
+        # the plain index=True index on college
+        Index("idx_student_college_usn_email", "college", postgresql_include=["usn", "email"]),
     )
 
     # --------------------------------------------------
@@ -64,7 +74,7 @@ class Student(Base):
     # BASIC DETAILS
     # --------------------------------------------------
 
-    college: Mapped[str] = mapped_column(String(120), nullable=False, index=True)
+    college: Mapped[str] = mapped_column(String(120), nullable=False)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     usn: Mapped[str] = mapped_column(String(30), nullable=False, index=True)
     branch: Mapped[str] = mapped_column(String(80), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, func
+from sqlalchemy import String, Integer, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -7,6 +7,16 @@ from app.core.database import Base
 class StudentOtpSession(Base):
     __tablename__ = "student_otp_sessions"
 
+    __table_args__ = (
+        # latest unused OTP per email (see verify_student_otp_and_issue_token)
+        Index(
+            "idx_student_otp_email_id",
+            "email",
+            text("id DESC"),
+            postgresql_where=text("used_at IS NULL"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
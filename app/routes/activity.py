@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_student, get_current_admin
+from app.core.dependencies import get_admin_principal, get_student_principal
 
 from app.schemas.activity import (
     ActivityTypeOut,
@@ -330,7 +330,7 @@ async def get_types(db: AsyncSession = Depends(get_db)):
 async def request_type(
     payload: RequestActivityTypeIn,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await request_new_activity_type(db, payload.name, payload.description)
 
@@ -339,7 +339,7 @@ async def request_type(
 async def create_activity_session(
     payload: CreateSessionIn,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     s = await create_session(
         db,
@@ -356,7 +356,7 @@ async def create_activity_session_from_event(
     event_id: int = Query(..., ge=1),
     description: str | None = Query(None),
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     r = await db.execute(select(Event).where(Event.id == event_id, Event.is_active == True))
     ev = r.scalar_one_or_none()
@@ -454,7 +454,7 @@ async def upload_activity_photo(
     sha256: str | None = Query(None),
     image: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await _handle_photo_upload_and_save(
         db=db,
@@ -473,7 +473,7 @@ async def upload_activity_photo(
 async def resubmit_session(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     s = await db.get(ActivitySession, session_id)
     if not s or s.student_id != student.id:
@@ -496,7 +496,7 @@ async def resubmit_session(
 async def submit_activity(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     session, newly, total_points, total_hours = await submit_session(db, student.id, session_id)
 
@@ -516,7 +516,7 @@ async def submit_activity(
 @router.get("/sessions", response_model=list[SessionListItemOut])
 async def my_sessions(
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await list_student_sessions(db, student.id)
 
@@ -525,7 +525,7 @@ async def my_sessions(
 async def session_detail(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await get_student_session_detail(db, student.id, session_id)
 
@@ -537,7 +537,7 @@ async def session_detail(
 async def admin_list_types(
     include_pending: bool = True,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await list_activity_types(db, include_pending=include_pending)
 
@@ -554,7 +554,7 @@ async def admin_update_activity_type_geo(
     type_id: int,
     payload: AdminUpdateActivityTypeGeoIn,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     res = await db.execute(select(ActivityType).where(ActivityType.id == type_id))
     at = res.scalar_one_or_none()
@@ -597,7 +597,7 @@ async def legacy_upload_submission_photo(
     file: UploadFile | None = File(None),
     photo: UploadFile | None = File(None),
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     cap = meta_captured_at or captured_at or meta_captured_at_f or captured_at_f
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_student
+from app.core.dependencies import get_student_principal
 
 from app.schemas.activity_summary import StudentActivitySummaryOut
 from app.controllers.activity_summary_controller import get_student_activity_summary
@@ -13,6 +13,6 @@ router = APIRouter(prefix="/student/activity", tags=["Student - Activity"])
 @router.get("/summary", response_model=StudentActivitySummaryOut)
 async def summary(
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await get_student_activity_summary(db, student.id)
\ No newline at end of file
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import get_admin_principal
 from app.models.activity_type import ActivityType, ActivityTypeStatus
 from app.schemas.activity_type import (
     ActivityTypeCreate,
@@ -51,7 +51,7 @@ async def list_activity_types(
 async def create_activity_type(
     payload: ActivityTypeCreate,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     name = payload.name.strip()
 
@@ -82,7 +82,7 @@ async def create_activity_type(
 async def get_activity_type(
     activity_type_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     res = await db.execute(select(ActivityType).where(ActivityType.id == activity_type_id))
     row = res.scalar_one_or_none()
@@ -96,7 +96,7 @@ async def update_activity_type(
     activity_type_id: int,
     payload: ActivityTypeUpdate,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     res = await db.execute(select(ActivityType).where(ActivityType.id == activity_type_id))
     row = res.scalar_one_or_none()
@@ -149,7 +149,7 @@ async def update_activity_type(
 async def deactivate_activity_type(
     activity_type_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     res = await db.execute(select(ActivityType).where(ActivityType.id == activity_type_id))
     row = res.scalar_one_or_none()
@@ -7,7 +7,7 @@ import csv
 import io
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import get_admin_principal
 
 from app.models.certificate import Certificate
 from app.models.student import Student
@@ -24,7 +24,7 @@ async def list_certificates(
     limit: int = Query(500, ge=1, le=2000),
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     total = (await db.execute(select(func.count(Certificate.id)))).scalar() or 0
 
@@ -70,7 +70,7 @@ async def list_certificates(
 async def student_progress(
     limit: int = Query(60, ge=1, le=500),
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     # activities = total event submissions
     sub_stmt = (
@@ -118,7 +118,7 @@ async def student_progress(
 async def certificate_download_url(
     certificate_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     cert = (
         await db.execute(select(Certificate).where(Certificate.id == certificate_id))
@@ -137,7 +137,7 @@ async def certificate_download_url(
 @router.get("/export")
 async def export_certificates_csv(
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     stmt = (
         select(
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import get_admin_principal
 
 from app.models.student import Student
 from app.models.faculty import Faculty  # ✅ adjust if your actual model name differs
@@ -39,7 +39,7 @@ def _is_approved_status_col(col):
 @router.get("/stats")
 async def dashboard_stats(
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     total_students = (await db.execute(select(func.count(Student.id)))).scalar() or 0
 
@@ -90,7 +90,7 @@ async def dashboard_stats(
 @router.get("/category-progress")
 async def category_progress(
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     # We can derive category from certificates (since cert has activity_type_id),
     # BUT submissions may exist before certificate issuance.
@@ -144,7 +144,7 @@ async def category_progress(
 async def student_progress(
     limit: int = Query(12, ge=1, le=50),
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     act_stmt = (
         select(
@@ -191,7 +191,7 @@ async def student_progress(
 async def recent_submissions(
     limit: int = Query(6, ge=1, le=20),
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     stmt = (
         select(
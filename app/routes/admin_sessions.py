@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import get_current_admin, get_admin_principal
 
 from app.models.activity_session import ActivitySessionStatus
 
@@ -45,7 +45,7 @@ async def list_sessions(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     parsed_status: Optional[ActivitySessionStatus] = None
     include_all = False
@@ -79,7 +79,7 @@ async def list_sessions(
 async def get_session_detail(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     """
     Returns full session detail including:
@@ -137,7 +137,7 @@ async def reject_session(
     session_id: int,
     payload: RejectBody,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     session = await admin_reject_session(
         db=db,
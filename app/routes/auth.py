@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.controllers.auth_controller import get_me, login, faculty_login
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import not_authenticated, get_admin_principal, Principal
 from app.models.admin import Admin
 
 from app.schemas.auth import LoginRequest, LoginResponse, FacultyLoginResponse, MeResponse
@@ -41,9 +41,14 @@ async def faculty_login_route(
     summary="Get Current Admin",
 )
 async def me(
-    current_admin: Admin = Depends(get_current_admin),
+    principal: Principal = Depends(get_admin_principal),
+    db: AsyncSession = Depends(get_db),
 ) -> MeResponse:
-    return await get_me(current_admin)
+    # fresh row, not the cached principal: last_login_at etc. must be current
+    admin = await db.get(Admin, principal.id)
+    if admin is None:
+        raise not_authenticated()
+    return await get_me(admin)
 
 
 @router.post(
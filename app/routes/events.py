@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete as sql_delete
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_student, get_current_admin
+from app.core.dependencies import get_admin_principal, get_student_principal
 from app.core.activity_storage import upload_activity_image
 
 from app.models.events import Event, EventSubmission, EventSubmissionPhoto
@@ -140,7 +140,7 @@ def _haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
 async def admin_create_event_api(
     payload: EventCreateIn,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await create_event(db, payload)
 
@@ -149,7 +149,7 @@ async def admin_create_event_api(
 async def admin_event_thumbnail_upload_url(
     payload: ThumbnailUploadUrlIn,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await get_event_thumbnail_upload_url(
         admin_id=admin.id,
@@ -163,7 +163,7 @@ async def admin_update_event_api(
     event_id: int,
     payload: EventCreateIn,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await update_event(db, event_id, payload)
 
@@ -172,7 +172,7 @@ async def admin_update_event_api(
 async def admin_delete_event_api(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     await delete_event(db, event_id)
 
@@ -181,7 +181,7 @@ async def admin_delete_event_api(
 async def admin_end_event_api(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await end_event(db, event_id)
 
@@ -190,7 +190,7 @@ async def admin_end_event_api(
 async def admin_auto_approve_and_issue(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await auto_approve_event_from_sessions(db, event_id)
 
@@ -199,7 +199,7 @@ async def admin_auto_approve_and_issue(
 async def admin_regenerate_event_certificates(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await regenerate_event_certificates(db, event_id)
 
@@ -207,7 +207,7 @@ async def admin_regenerate_event_certificates(
 @router.get("/admin/events", response_model=list[EventOut])
 async def admin_list_events_api(
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     res = await db.execute(select(Event).order_by(Event.id.desc()))
     events = res.scalars().all()
@@ -221,7 +221,7 @@ async def admin_list_events_api(
 @router.get("/student/events", response_model=list[EventOut])
 async def student_events(
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await list_active_events(db)
 
@@ -230,7 +230,7 @@ async def student_events(
 async def student_event_detail(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     res = await db.execute(select(Event).where(Event.id == event_id))
     ev = res.scalar_one_or_none()
@@ -243,7 +243,7 @@ async def student_event_detail(
 async def student_event_certificates(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await list_student_event_certificates(db=db, student_id=student.id, event_id=event_id)
 
@@ -252,7 +252,7 @@ async def student_event_certificates(
 async def register_event(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await register_for_event(db, student.id, event_id)
 
@@ -261,7 +261,7 @@ async def register_event(
 async def student_event_draft(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await get_student_event_draft_progress(db, student.id, event_id)
 
@@ -288,7 +288,7 @@ async def upload_photos(
     longitude: float | None = Form(None),
 
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     sub_res = await db.execute(
         select(EventSubmission).where(
@@ -373,17 +373,20 @@ async def upload_photos(
         if seq_no > required_photos:
             break
 
-        file_bytes = await img.read()
-        if not file_bytes:
+        if not img.size:
             seq_no += 1
             continue
 
+        # stream the spooled upload straight to MinIO (bytes are not needed here)
+        await img.seek(0)
         image_url = await upload_activity_image(
-            file_bytes=file_bytes,
+            file_bytes=None,
             content_type=img.content_type or "application/octet-stream",
             filename=img.filename or f"event_{submission_id}_{seq_no}.jpg",
             student_id=student.id,
             session_id=submission_id,
+            stream=img.file,
+            length=img.size,
         )
 
         lat_val = normalized_lats[idx]
@@ -435,7 +438,7 @@ async def submit_event(
     submission_id: int,
     payload: FinalSubmitIn,
     db: AsyncSession = Depends(get_db),
-    student=Depends(get_current_student),
+    student=Depends(get_student_principal),
 ):
     return await final_submit(db, submission_id, student.id, payload.description)
 
@@ -448,7 +451,7 @@ async def submit_event(
 async def admin_list_event_submissions(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await list_event_submissions(db, event_id)
 
@@ -457,7 +460,7 @@ async def admin_list_event_submissions(
 async def approve_event_submission_api(
     submission_id: int,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await approve_submission(db, submission_id)
 
@@ -467,6 +470,6 @@ async def reject_event_submission_api(
     submission_id: int,
     payload: RejectIn,
     db: AsyncSession = Depends(get_db),
-    admin=Depends(get_current_admin),
+    admin=Depends(get_admin_principal),
 ):
     return await reject_submission(db, submission_id, payload.reason)
\ No newline at end of file
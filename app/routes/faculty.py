@@ -6,9 +6,8 @@ import csv
 import io
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_admin, get_current_faculty
+from app.core.dependencies import get_current_faculty, get_admin_principal, Principal
 
-from app.models.admin import Admin
 from app.models.faculty import Faculty
 from app.models.student import Student
 
@@ -56,7 +55,7 @@ async def add_faculty(
     role: str = Form("faculty"),
     image: UploadFile | None = File(None),
     db: AsyncSession = Depends(get_db),
-    admin: Admin = Depends(get_current_admin),
+    admin: Principal = Depends(get_admin_principal),
 ):
     payload = FacultyCreateRequest(full_name=full_name, college=college, email=email, role=role)
 
@@ -89,7 +88,7 @@ async def add_faculty(
 async def import_faculty_csv(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    admin: Admin = Depends(get_current_admin),
+    admin: Principal = Depends(get_admin_principal),
 ):
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="Please upload a .csv file")
@@ -166,7 +165,7 @@ async def import_faculty_csv(
 @router.get("", response_model=list[FacultyResponse], summary="List faculty (Admin only)")
 async def list_faculty(
     db: AsyncSession = Depends(get_db),
-    admin: Admin = Depends(get_current_admin),
+    admin: Principal = Depends(get_admin_principal),
 ):
     q = await db.execute(select(Faculty).order_by(Faculty.created_at.desc()))
     items = q.scalars().all()
@@ -177,14 +176,14 @@ async def list_faculty(
 async def delete_faculty(
     faculty_id: int,
     db: AsyncSession = Depends(get_db),
-    admin: Admin = Depends(get_current_admin),
+    admin: Principal = Depends(get_admin_principal),
 ):
     result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
     faculty = result.scalar_one_or_none()
     if not faculty:
         raise HTTPException(status_code=404, detail="Faculty not found")
     await db.delete(faculty)
-    await db.commit()
+    await db.commit()  # also drops the cached principal (see dependencies.py)
     return {"detail": f"Faculty {faculty_id} deleted"}
 
 
@@ -4,6 +4,7 @@ import mimetypes
 from urllib.parse import quote
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
 from app.core.config import settings
@@ -28,10 +29,11 @@ async def get_object(
         m = get_minio()
 
         # stat to confirm existence + get content-type if available
-        st = m.stat_object(bucket, object_name)
+        # (sync SDK calls run in the threadpool, not on the event loop)
+        st = await run_in_threadpool(m.stat_object, bucket, object_name)
         content_type = getattr(st, "content_type", None) or mimetypes.guess_type(object_name)[0] or "application/octet-stream"
 
-        obj = m.get_object(bucket, object_name)
+        obj = await run_in_threadpool(m.get_object, bucket, object_name)
 
         # Stream response
         filename = object_name.split("/")[-1] or "file"
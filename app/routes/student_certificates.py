@@ -5,10 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_student
+from app.core.dependencies import get_student_principal, Principal
 from app.core.cert_storage import presign_certificate_download_url
 
-from app.models.student import Student
 from app.models.certificate import Certificate
 
 router = APIRouter(prefix="/student/certificates", tags=["Student - Certificates"])
@@ -19,7 +18,7 @@ async def get_certificate_download_url(
     submission_id: int,
     expires_in: int = Query(3600, ge=60, le=604800, description="Presigned URL expiry in seconds"),
     db: AsyncSession = Depends(get_db),
-    student: Student = Depends(get_current_student),
+    student: Principal = Depends(get_student_principal),
 ):
     """
     Returns { url, expires_in } for React Native to open/download.
@@ -6,9 +6,10 @@ from sqlalchemy import select, or_, func
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_faculty, get_current_admin, get_current_student
+from app.core.dependencies import (
+    not_authenticated, get_current_faculty, get_admin_principal, get_student_principal, Principal,
+)
 from app.models.faculty import Faculty
-from app.models.admin import Admin
 from app.models.student import Student, StudentType
 from app.models.events import EventSubmission
 from app.models.certificate import Certificate
@@ -197,6 +198,7 @@ async def add_student_manual(
             payload,
             faculty_college=current_faculty.college,
             faculty_id=current_faculty.id,
+            mentor=current_faculty,
         )
         return _student_out(s, activities_count=0, certificates_count=0)
     except ValueError as e:
@@ -249,7 +251,7 @@ async def list_students_admin(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     activities_sq = (
         select(
@@ -326,7 +328,7 @@ async def update_student_admin(
     student_id: int,
     payload: StudentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     res = await db.execute(
         select(Student)
@@ -396,7 +398,7 @@ async def update_student_points_admin(
     student_id: int,
     payload: StudentPointsUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     s = await db.get(Student, student_id)
     if not s:
@@ -423,7 +425,7 @@ async def update_student_points_admin(
 async def get_student_activity_points_admin(
     student_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     try:
         student, items = await get_student_point_adjustments(db, student_id=student_id)
@@ -440,7 +442,7 @@ async def create_student_activity_point_admin(
     student_id: int,
     payload: StudentPointAdjustmentCreate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     try:
         item, total_points = await create_student_point_adjustment(
@@ -473,7 +475,7 @@ async def update_student_activity_point_admin(
     adjustment_id: int,
     payload: StudentPointAdjustmentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     try:
         item, total_points = await update_student_point_adjustment(
@@ -501,7 +503,7 @@ async def update_student_activity_point_admin(
 async def delete_student_activity_point_admin(
     adjustment_id: int,
     db: AsyncSession = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_admin_principal),
 ):
     try:
         total_points = await delete_student_point_adjustment(
@@ -527,8 +529,13 @@ student_router = APIRouter(prefix="/students", tags=["Student - Profile"])
 
 @student_router.get("/me")
 async def get_student_me(
-    current_student: Student = Depends(get_current_student),
+    principal: Principal = Depends(get_student_principal),
+    db: AsyncSession = Depends(get_db),
 ):
+    # fresh row, not the cached principal: face_enrolled / points change often
+    current_student = await db.get(Student, principal.id)
+    if current_student is None:
+        raise not_authenticated()
     return {
         "id": current_student.id,
         "name": current_student.name,
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import load_all
+
+load_all()
+
+from app.core.database import get_db  # noqa: E402
+from app.core.dependencies import get_admin_principal, get_current_admin  # noqa: E402
+from app.core.jwt import create_access_token as create_student_token  # noqa: E402
+from app.core.security import create_access_token as create_admin_token  # noqa: E402
+
+
+class _FakeResult:
+    def first(self):
+        return SimpleNamespace(id=1, is_active=True)
+
+
+class _FakeSession:
+    """Every lookup finds an active admin with id 1."""
+
+    async def execute(self, *args, **kwargs):
+        return _FakeResult()
+
+    async def get(self, model, key, **kwargs):
+        return model(id=key, name="Admin", email="admin@example.org", is_active=True)
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/admin-full")
+    async def admin_full(admin=Depends(get_current_admin)):
+        return {"id": admin.id}
+
+    @app.get("/admin-light")
+    async def admin_light(principal=Depends(get_admin_principal)):
+        return {"id": principal.id}
+
+    async def fake_db():
+        yield _FakeSession()
+
+    app.dependency_overrides[get_db] = fake_db
+    return TestClient(app)
+
+
+def test_student_token_is_rejected_on_admin_routes():
+    # same numeric sub as the admin row: must not authenticate as that admin
+    token = create_student_token({"sub": "1", "role": "student", "type": "access"})
+    client = _client()
+    for path in ("/admin-full", "/admin-light"):
+        r = client.get(path, headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code in (401, 403), (path, r.status_code)
+
+
+def test_admin_token_is_accepted_on_admin_routes():
+    token = create_admin_token(1, "admin@example.org")
+    client = _client()
+    for path in ("/admin-full", "/admin-light"):
+        r = client.get(path, headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code == 200, (path, r.status_code, r.text)
+        assert r.json() == {"id": 1}
+
+
+def test_admin_routes_declare_bearer_security_scheme():
+    schema = _client().get("/openapi.json").json()
+    assert schema["components"]["securitySchemes"]["HTTPBearer"] == {"type": "http", "scheme": "bearer"}
+    for path in ("/admin-full", "/admin-light"):
+        assert schema["paths"][path]["get"]["security"] == [{"HTTPBearer": []}]